@@ -0,0 +1,90 @@
+from functools import lru_cache
+from typing import Dict, Optional
+import redis
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from config.settings import get_settings
+
+def engine_options(database_url: str) -> Dict:
+    if not database_url.startswith('postgresql'):
+        return {}
+    
+    settings = get_settings()
+    return {
+        'pool_size': settings.DB_POOL_SIZE,
+        'max_overflow': settings.DB_MAX_OVERFLOW,
+        'pool_timeout': settings.DB_POOL_TIMEOUT,
+        'pool_recycle': settings.DB_POOL_RECYCLE,
+        'pool_pre_ping': settings.DB_POOL_PRE_PING,
+    }
+
+@lru_cache()
+def get_db_engine():
+    from src.database.models import get_engine
+    
+    settings = get_settings()
+    return get_engine(settings.database_url, **engine_options(settings.database_url))
+
+@lru_cache()
+def get_async_engine() -> AsyncEngine:
+    settings = get_settings()
+    return create_async_engine(settings.async_database_url, **engine_options(settings.async_database_url))
+
+@lru_cache()
+def get_async_session_factory() -> async_sessionmaker:
+    return async_sessionmaker(get_async_engine(), expire_on_commit=False)
+
+@lru_cache()
+def get_redis_pool() -> redis.ConnectionPool:
+    settings = get_settings()
+    return redis.ConnectionPool(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        db=settings.REDIS_DB,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        decode_responses=True
+    )
+
+def get_redis_client() -> redis.Redis:
+    return redis.Redis(connection_pool=get_redis_pool())
+
+def engine_pool_stats(engine, max_overflow: Optional[int] = None) -> Dict:
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {'pool': type(pool).__name__}
+    
+    size = pool.size()
+    checked_out = pool.checkedout()
+    capacity = size + max(get_settings().DB_MAX_OVERFLOW if max_overflow is None else max_overflow, 0)
+    return {
+        'pool': type(pool).__name__,
+        'size': size,
+        'checked_in': pool.checkedin(),
+        'checked_out': checked_out,
+        'overflow': pool.overflow(),
+        'utilization': checked_out / capacity if capacity else 0.0,
+    }
+
+def redis_pool_stats(pool: redis.ConnectionPool) -> Dict:
+    stats = {'max_connections': pool.max_connections}
+    try:
+        in_use = len(pool._in_use_connections)
+        stats.update({
+            'created': pool._created_connections,
+            'available': len(pool._available_connections),
+            'in_use': in_use,
+            'utilization': in_use / pool.max_connections if pool.max_connections else 0.0,
+        })
+    except (AttributeError, TypeError) as e:
+        print(f"Redis pool stats unavailable: {e}")
+    return stats
+
+def get_pool_stats() -> Dict[str, Dict]:
+    stats = {}
+    if get_db_engine.cache_info().currsize:
+        stats['database'] = engine_pool_stats(get_db_engine())
+    if get_async_engine.cache_info().currsize:
+        stats['database_async'] = engine_pool_stats(get_async_engine().sync_engine)
+    if get_redis_pool.cache_info().currsize:
+        stats['redis'] = redis_pool_stats(get_redis_pool())
+    return stats
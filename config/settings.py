@@ -8,23 +8,62 @@ class Settings(BaseSettings):
     KAFKA_BOOTSTRAP_SERVERS: str = "localhost:9092"
     KAFKA_TOPIC_SALES: str = "sales-events"
     KAFKA_TOPIC_PROCESSED: str = "sales-processed"
+    KAFKA_LINGER_MS: int = 20
+    KAFKA_BATCH_SIZE: int = 65536
+    KAFKA_COMPRESSION_TYPE: str = ""
+    KAFKA_MAX_IN_FLIGHT: int = 10000
+    KAFKA_SERIALIZER: str = "json"
+    
+    STREAM_API_URL: str = "http://localhost:8000/stream"
+    STREAM_RATE: int = 1000
+    STREAM_BATCH_SIZE: int = 500
+    STREAM_RECONNECT_MAX_DELAY: float = 30.0
+    
+    CONSUMER_BATCH_SIZE: int = 500
+    CONSUMER_FLUSH_INTERVAL: float = 1.0
+    CONSUMER_WORKERS: int = 4
+    DEDUP_LOCAL_SIZE: int = 200000
+    DEDUP_TTL: int = 86400
+    
+    PROCESSOR_WINDOW_SECONDS: int = 60
+    PROCESSOR_SLIDING_WINDOW_SECONDS: int = 300
+    PROCESSOR_ALLOWED_LATENESS: int = 10
+    PROCESSOR_RESULT_TTL: int = 3600
     
     POSTGRES_USER: str = "postgres"
     POSTGRES_PASSWORD: str = "postgres"
     POSTGRES_HOST: str = "localhost"
     POSTGRES_PORT: int = 5432
     POSTGRES_DB: str = "sales_analytics"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 10
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    
+    TRANSACTIONS_PARTITION_INTERVAL: str = ""
+    TRANSACTIONS_PARTITIONS_AHEAD: int = 3
+    TRANSACTIONS_RETENTION_DAYS: int = 30
     
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
     REDIS_CACHE_TTL: int = 3600
+    REDIS_MAX_CONNECTIONS: int = 50
+    LOCAL_CACHE_SIZE: int = 0
+    LOCAL_CACHE_TTL: int = 30
+    CACHE_INVALIDATION_CHANNEL: str = "cache-invalidation"
+    LIVE_METRICS_RETENTION_HOURS: int = 48
+    DASHBOARD_REFRESH_SECONDS: int = 5
+    DASHBOARD_CACHE_TTL: int = 30
+    QUERY_CACHE_INVALIDATION_INTERVAL: float = 30.0
     
     SPARK_APP_NAME: str = "SalesStreamProcessor"
     SPARK_MASTER: str = "local[*]"
     
     API_HOST: str = "0.0.0.0"
     API_PORT: int = 8000
+    SIMULATOR_SKEW: float = 0.0
     
     DASHBOARD_HOST: str = "0.0.0.0"
     DASHBOARD_PORT: int = 8501
@@ -33,6 +72,10 @@ class Settings(BaseSettings):
     def database_url(self) -> str:
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
     
+    @property
+    def async_database_url(self) -> str:
+        return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+    
     @property
     def redis_url(self) -> str:
         return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/{self.REDIS_DB}"
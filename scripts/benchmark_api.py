@@ -0,0 +1,72 @@
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def worker(client, path, requests_per_worker, latencies, errors):
+    for _ in range(requests_per_worker):
+        start = time.perf_counter()
+        try:
+            response = await client.get(path)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+        except httpx.HTTPError:
+            errors.append(path)
+
+
+async def run(base_url, path, concurrency, requests_per_worker):
+    latencies = []
+    errors = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*[
+            worker(client, path, requests_per_worker, latencies, errors)
+            for _ in range(concurrency)
+        ])
+        elapsed = time.perf_counter() - start
+    
+    return latencies, errors, elapsed
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the analytics API endpoints')
+    parser.add_argument('--url', default='http://localhost:8000')
+    parser.add_argument('--path', action='append',
+                        help='Endpoint to hit; repeat for several (default: all analytics endpoints)')
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--requests', type=int, default=20, help='Requests per concurrent client')
+    args = parser.parse_args()
+    
+    paths = args.path or [
+        '/analytics/top-products',
+        '/analytics/categories',
+        '/analytics/revenue?period=hour&hours=24',
+        '/analytics/customers/CUST000001/ltv',
+    ]
+    
+    print(f'{"endpoint":<45} {"req/s":>10} {"p50 ms":>8} {"p99 ms":>8} {"errors":>7}')
+    for path in paths:
+        latencies, errors, elapsed = asyncio.run(run(args.url, path, args.concurrency, args.requests))
+        if not latencies:
+            print(f'{path:<45} {"-":>10} {"-":>8} {"-":>8} {len(errors):>7}')
+            continue
+        print(
+            f'{path:<45} {len(latencies) / elapsed:>10,.0f} '
+            f'{statistics.median(latencies) * 1000:>8.1f} '
+            f'{percentile(latencies, 99) * 1000:>8.1f} {len(errors):>7}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import threading
+import time
+from collections import namedtuple
+
+from src.kafka.producer import SalesProducer
+
+RecordMetadata = namedtuple('RecordMetadata', ['topic', 'partition', 'offset'])
+
+
+class StandInFuture:
+    def __init__(self):
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = []
+        self.value = None
+
+    def add_callback(self, fn):
+        with self._lock:
+            if not self._done.is_set():
+                self._callbacks.append(fn)
+                return self
+        fn(self.value)
+        return self
+
+    def add_errback(self, fn):
+        return self
+
+    def resolve(self, value):
+        with self._lock:
+            self.value = value
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            fn(value)
+
+    def get(self, timeout=None):
+        if not self._done.wait(timeout):
+            raise TimeoutError('Timed out waiting for acknowledgement')
+        return self.value
+
+
+class StandInBroker:
+    def __init__(self, round_trip_ms: float = 2.0, linger_ms: float = 0.0):
+        self.round_trip = round_trip_ms / 1000
+        self.linger = linger_ms / 1000
+        self.offset = 0
+        self._pending = []
+        self._unacked = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def send(self, topic, value=None, headers=None):
+        future = StandInFuture()
+        with self._cond:
+            self._pending.append((topic, future))
+            self._unacked += 1
+            self._cond.notify()
+        return future
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed and not self._pending:
+                    return
+            time.sleep(self.linger + self.round_trip)
+            with self._cond:
+                batch, self._pending = self._pending, []
+            for topic, future in batch:
+                future.resolve(RecordMetadata(topic, 0, self.offset))
+                self.offset += 1
+            with self._cond:
+                self._unacked -= len(batch)
+                self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        with self._cond:
+            self._cond.wait_for(lambda: not self._unacked, timeout)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+
+def make_events(n: int):
+    return [
+        {
+            'transaction_id': f'TXN{i:08d}',
+            'timestamp': '2024-01-01T00:00:00',
+            'customer_id': 'CUST000001',
+            'product_id': 'PRD00001',
+            'quantity': 1,
+            'unit_price': 10.0,
+            'total_amount': 10.0,
+            'payment_method': 'credit_card',
+            'status': 'completed'
+        }
+        for i in range(n)
+    ]
+
+
+def bench_sync(events, round_trip_ms):
+    producer = SalesProducer(producer=StandInBroker(round_trip_ms))
+    start = time.perf_counter()
+    for event in events:
+        producer.send_event(event)
+    elapsed = time.perf_counter() - start
+    producer.close()
+    return elapsed
+
+
+def bench_async(events, round_trip_ms, linger_ms, max_in_flight):
+    producer = SalesProducer(
+        max_in_flight=max_in_flight,
+        producer=StandInBroker(round_trip_ms, linger_ms)
+    )
+    start = time.perf_counter()
+    producer.send_many(events)
+    producer.flush()
+    elapsed = time.perf_counter() - start
+    delivered = producer.delivered
+    producer.close()
+    return elapsed, delivered
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare SalesProducer send paths against a stand-in broker')
+    parser.add_argument('--events', type=int, default=2000)
+    parser.add_argument('--round-trip-ms', type=float, default=2.0)
+    parser.add_argument('--linger-ms', type=float, default=5.0)
+    parser.add_argument('--max-in-flight', type=int, default=10000)
+    args = parser.parse_args()
+
+    events = make_events(args.events)
+
+    elapsed = bench_sync(events, args.round_trip_ms)
+    print(f'send_event (sync):  {len(events) / elapsed:>12,.0f} events/sec ({elapsed:.2f}s)')
+
+    elapsed, delivered = bench_async(events, args.round_trip_ms, args.linger_ms, args.max_in_flight)
+    print(f'send_many (async):  {delivered / elapsed:>12,.0f} events/sec ({elapsed:.2f}s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import json
+import time
+
+from src.api.main import SalesSimulator
+from src.kafka.serializers import SERIALIZERS, get_serializer
+
+
+class StdlibJsonSerializer:
+    name = 'json (stdlib)'
+
+    def dumps(self, event):
+        return json.dumps(event).encode('utf-8')
+
+    def loads(self, data):
+        return json.loads(data.decode('utf-8'))
+
+
+def bench(serializer, events):
+    start = time.perf_counter()
+    encoded = [serializer.dumps(event) for event in events]
+    encode_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for data in encoded:
+        serializer.loads(data)
+    decode_time = time.perf_counter() - start
+
+    return sum(len(data) for data in encoded) / len(encoded), len(events) / encode_time, len(events) / decode_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare Kafka event serializers')
+    parser.add_argument('--events', type=int, default=100000)
+    args = parser.parse_args()
+
+    events = SalesSimulator(seed=42).generate_batch(args.events)
+    serializers = [StdlibJsonSerializer()]
+    for name in SERIALIZERS:
+        try:
+            serializers.append(get_serializer(name))
+        except ImportError as e:
+            print(f'Skipping {name}: {e}')
+
+    print(f'\n{"format":<15} {"bytes/event":>12} {"encode/sec":>12} {"decode/sec":>12}')
+    for serializer in serializers:
+        size, encode_rate, decode_rate = bench(serializer, events)
+        print(f'{serializer.name:<15} {size:>12.1f} {encode_rate:>12,.0f} {decode_rate:>12,.0f}')
+
+
+if __name__ == '__main__':
+    main()
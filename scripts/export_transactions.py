@@ -0,0 +1,65 @@
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import time
+from datetime import datetime, timedelta
+from config.resources import get_db_engine
+from src.database.models import get_session
+from src.database.operations import DatabaseOperations
+
+
+def write_frames(frames, output):
+    rows = 0
+    start = time.perf_counter()
+    writer = None
+    try:
+        for frame in frames:
+            if output.suffix == '.parquet':
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                writer = writer or pq.ParquetWriter(output, table.schema)
+                writer.write_table(table)
+            else:
+                frame.to_csv(output, mode='a' if rows else 'w', header=not rows, index=False)
+            rows += len(frame)
+            print(f'  {rows:,} rows - {rows / (time.perf_counter() - start):,.0f} rows/sec')
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export transactions in constant memory')
+    parser.add_argument('--days', type=int, default=30, help='Export the last N days')
+    parser.add_argument('--output', type=Path, default=project_root / 'data' / 'export' / 'transactions.csv',
+                        help='Destination .csv or .parquet file')
+    parser.add_argument('--chunk-size', type=int, default=50000)
+    parser.add_argument('--columns', nargs='+', help='Columns to export (default: all)')
+    args = parser.parse_args()
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    session = get_session(get_db_engine())
+    try:
+        ops = DatabaseOperations(session)
+        frames = ops.iter_transaction_frames(
+            start=datetime.utcnow() - timedelta(days=args.days),
+            columns=args.columns,
+            chunk_size=args.chunk_size
+        )
+        print(f'Exporting transactions from the last {args.days} days to {args.output}...')
+        rows = write_frames(frames, args.output)
+        print(f'\nExported {rows:,} transactions')
+    except Exception as e:
+        print(f'\nError exporting data: {e}')
+    finally:
+        session.close()
+
+
+if __name__ == '__main__':
+    main()
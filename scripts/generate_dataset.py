@@ -1,8 +1,10 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+import argparse
 import json
 import random
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 np.random.seed(41)
@@ -59,33 +61,107 @@ def generate_customers(n=1000):
     return pd.DataFrame(customers)
 
 
-def generate_transactions(products_df, customers_df, n=10000):
-    transactions = []
-
-    for i in range(n):
-        product = products_df.sample(1).iloc[0]
-        customer = customers_df.sample(1).iloc[0]
-        quantity = np.random.randint(1, 6)
-        days_ago = random.randint(0, 30)
-        hours_ago = random.randint(0, 23)
-        minutes_ago = random.randint(0, 59)
-
-        transactions.append({
-            'transaction_id': f'TXN{i:08d}',
-            'timestamp': str(datetime.now() - timedelta(days=days_ago, hours=hours_ago, minutes=minutes_ago)),
-            'customer_id': customer['customer_id'],
-            'product_id': product['product_id'],
-            'quantity': quantity,
-            'unit_price': product['price'],
-            'total_amount': round(product['price'] * quantity, 2),
-            'payment_method': np.random.choice(['credit_card', 'paypal', 'debit_card', 'crypto']),
-            'status': np.random.choice(['completed', 'pending', 'failed'], p=[0.85, 0.10, 0.05])
-        })
-
-    return pd.DataFrame(transactions)
+PAYMENT_METHODS = np.array(['credit_card', 'paypal', 'debit_card', 'crypto'])
+STATUSES = np.array(['completed', 'pending', 'failed'])
+STATUS_WEIGHTS = [0.85, 0.10, 0.05]
+
+
+def generate_transactions(products_df, customers_df, n=10000, seed=41, start_id=0, now=None):
+    rng = np.random.default_rng(seed)
+    now = pd.Timestamp(now or datetime.now())
+
+    product_ids = products_df['product_id'].to_numpy()
+    prices = products_df['price'].to_numpy()
+    customer_ids = customers_df['customer_id'].to_numpy()
+
+    product_idx = rng.integers(0, len(product_ids), n)
+    customer_idx = rng.integers(0, len(customer_ids), n)
+    quantity = rng.integers(1, 6, n)
+    seconds_ago = (
+        rng.integers(0, 31, n) * 86400
+        + rng.integers(0, 24, n) * 3600
+        + rng.integers(0, 60, n) * 60
+    )
+    unit_price = prices[product_idx]
+
+    return pd.DataFrame({
+        'transaction_id': 'TXN' + pd.Series(np.arange(start_id, start_id + n)).astype(str).str.zfill(8),
+        'timestamp': now - pd.to_timedelta(seconds_ago, unit='s'),
+        'customer_id': customer_ids[customer_idx],
+        'product_id': product_ids[product_idx],
+        'quantity': quantity,
+        'unit_price': unit_price,
+        'total_amount': np.round(unit_price * quantity, 2),
+        'payment_method': PAYMENT_METHODS[rng.integers(0, len(PAYMENT_METHODS), n)],
+        'status': rng.choice(STATUSES, size=n, p=STATUS_WEIGHTS)
+    })
+
+
+def shard_seed(seed, shard_index):
+    return np.random.SeedSequence([seed, shard_index])
+
+
+def write_shard(products_df, customers_df, shard_index, start_id, n, seed, output_dir, output_format, now):
+    transactions = generate_transactions(
+        products_df, customers_df, n,
+        seed=shard_seed(seed, shard_index),
+        start_id=start_id,
+        now=now
+    )
+    path = Path(output_dir) / f'part-{shard_index:05d}.{output_format}'
+    if output_format == 'parquet':
+        transactions.to_parquet(path, index=False)
+    else:
+        transactions.to_csv(path, index=False)
+    return len(transactions), float(transactions['total_amount'].sum())
+
+
+def clear_shards(output_dir):
+    for stale in Path(output_dir).glob('part-*'):
+        stale.unlink()
+
+
+def generate_transaction_shards(products_df, customers_df, n, output_dir, shard_size=1_000_000,
+                                output_format='csv', workers=1, seed=41):
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    clear_shards(output_dir)
+
+    now = pd.Timestamp(datetime.now())
+    shards = [
+        (index, start, min(shard_size, n - start))
+        for index, start in enumerate(range(0, n, shard_size))
+    ]
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(write_shard, products_df, customers_df, index, start, size,
+                                seed, output_dir, output_format, now)
+                for index, start, size in shards
+            ]
+            results = [future.result() for future in futures]
+    else:
+        results = [
+            write_shard(products_df, customers_df, index, start, size, seed, output_dir, output_format, now)
+            for index, start, size in shards
+        ]
+
+    rows = sum(count for count, _ in results)
+    revenue = sum(total for _, total in results)
+    return rows, revenue
 
 
 def main():
+    parser = argparse.ArgumentParser(description='Generate the synthetic sales dataset')
+    parser.add_argument('--transactions', type=int, default=10000)
+    parser.add_argument('--shard-size', type=int, default=1_000_000,
+                        help='Rows per output shard; larger datasets are written to data/transactions/')
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=41)
+    args = parser.parse_args()
+
     data_dir = get_data_dir()
     print(f"Data directory: {data_dir}")
 
@@ -100,17 +176,29 @@ def main():
     customers.to_json(data_dir / 'customers.json', orient='records', indent=2)
 
     print("Generating transactions...")
-    transactions = generate_transactions(products, customers, 10000)
-    transactions.to_csv(data_dir / 'transactions.csv', index=False)
-    transactions.to_json(data_dir / 'transactions.json', orient='records', indent=2)
+    if args.transactions <= args.shard_size and args.format == 'csv':
+        clear_shards(data_dir / 'transactions')
+        transactions = generate_transactions(products, customers, args.transactions, seed=args.seed)
+        transactions.to_csv(data_dir / 'transactions.csv', index=False)
+        transactions.to_json(data_dir / 'transactions.json', orient='records', indent=2, date_format='iso')
+        transaction_count = len(transactions)
+        total_revenue = transactions['total_amount'].sum()
+    else:
+        transaction_count, total_revenue = generate_transaction_shards(
+            products, customers, args.transactions, data_dir / 'transactions',
+            shard_size=args.shard_size,
+            output_format=args.format,
+            workers=args.workers,
+            seed=args.seed
+        )
 
     print(f"\nDataset Summary:")
     print(f"Products: {len(products)}")
     print(f"Customers: {len(customers)}")
-    print(f"Transactions: {len(transactions)}")
-    print(f"Total Revenue: ${transactions['total_amount'].sum():,.2f}")
+    print(f"Transactions: {transaction_count}")
+    print(f"Total Revenue: ${total_revenue:,.2f}")
     print(f"\nFiles saved to: {data_dir}")
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -4,18 +4,83 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+import argparse
+import os
+import time
 import pandas as pd
-from sqlalchemy import create_engine
+from sqlalchemy import text
+from config.resources import get_db_engine
 from config.settings import get_settings
+from src.database.loader import copy_dataframe
+from src.database.models import init_db, get_session
+from src.database.partitions import PartitionManager
+from src.database.rollups import RollupAggregator
+from src.database.customer_stats import CustomerStatsAggregator
+
+
+def transaction_files(data_dir):
+    shards = sorted((data_dir / 'transactions').glob('part-*'))
+    return shards or [data_dir / 'transactions.csv']
+
+
+def read_chunks(path, chunk_size):
+    if not os.path.getsize(path):
+        return
+    if path.suffix == '.parquet':
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+def load_transactions(engine, paths, chunk_size, upsert=False):
+    total_bytes = sum(os.path.getsize(path) for path in paths)
+    read_bytes = 0
+    rows = 0
+    revenue = 0.0
+    start = time.perf_counter()
+    partitions = PartitionManager(engine)
+    partitioned = engine.dialect.name == 'postgresql' and partitions.is_partitioned()
+
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        for path in paths:
+            for chunk in read_chunks(path, chunk_size):
+                chunk['timestamp'] = pd.to_datetime(chunk['timestamp'])
+                if partitioned:
+                    partitions.ensure_partitions(start=chunk['timestamp'].min().to_pydatetime())
+                copy_dataframe(cursor, chunk, upsert=upsert)
+                connection.commit()
+
+                rows += len(chunk)
+                revenue += chunk['total_amount'].sum()
+                elapsed = time.perf_counter() - start
+                print(f'  {path.name}: {rows:,} rows - {rows / elapsed:,.0f} rows/sec')
+            read_bytes += os.path.getsize(path)
+            if total_bytes:
+                print(f'  {read_bytes / total_bytes:.0%} of transaction data loaded')
+    finally:
+        connection.close()
+
+    return rows, revenue
 
 
 def main():
+    parser = argparse.ArgumentParser(description='Load sample data into PostgreSQL')
+    parser.add_argument('--upsert', action='store_true',
+                        help='Merge transactions through a staging table instead of replacing them')
+    parser.add_argument('--chunk-size', type=int, default=100000,
+                        help='Number of CSV rows read and written per chunk')
+    args = parser.parse_args()
+
     settings = get_settings()
-    engine = create_engine(settings.database_url)
 
     print('Loading sample data into PostgreSQL...\n')
 
     try:
+        engine = init_db(settings.database_url, engine=get_db_engine())
         data_dir = project_root / 'data'
 
         print('Loading products...')
@@ -29,17 +94,27 @@ def main():
         print(f'Loaded {len(customers)} customers')
 
         print('Loading transactions...')
-        transactions = pd.read_csv(data_dir / 'transactions.csv')
-        transactions['timestamp'] = pd.to_datetime(transactions['timestamp'])
-        transactions.to_sql('transactions', engine, if_exists='replace', index=False)
-        print(f'Loaded {len(transactions)} transactions')
+        if not args.upsert:
+            with engine.begin() as connection:
+                connection.execute(text('TRUNCATE transactions'))
+        transaction_count, total_revenue = load_transactions(
+            engine, transaction_files(data_dir), args.chunk_size, upsert=args.upsert
+        )
+        print(f'Loaded {transaction_count} transactions')
+
+        print('Rebuilding sales rollups and customer stats...')
+        session = get_session(engine)
+        try:
+            RollupAggregator(session).rebuild()
+            CustomerStatsAggregator(session).rebuild()
+        finally:
+            session.close()
 
-        total_revenue = transactions['total_amount'].sum()
         print(f'\nDataset Summary:')
         print(f'Total Revenue: ${total_revenue:,.2f}')
         print(f'Products: {len(products)}')
         print(f'Customers: {len(customers)}')
-        print(f'Transactions: {len(transactions)}')
+        print(f'Transactions: {transaction_count}')
 
         print('\nData loaded successfully!')
         print('Access dashboard at http://localhost:8501')
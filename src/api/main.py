@@ -1,62 +1,137 @@
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.responses import Response, StreamingResponse
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 import asyncio
 import json
-import random
+import numpy as np
+import orjson
+from config.resources import get_async_session_factory, get_pool_stats
+from config.settings import get_settings
+from src.database.async_operations import AsyncDatabaseOperations
+from src.utils.helpers import TokenBucket
+
+settings = get_settings()
 
 app = FastAPI(title="Sales Stream API")
 
-class SalesEvent(BaseModel):
-    transaction_id: str
-    timestamp: datetime
-    customer_id: str
-    product_id: str
-    quantity: int
-    unit_price: float
-    total_amount: float
-    payment_method: str
-    status: str
+STREAM_FORMATS = {
+    'sse': 'text/event-stream',
+    'ndjson': 'application/x-ndjson',
+}
+MAX_BATCH_SIZE = 10000
+
+PAYMENT_METHODS = np.array(['credit_card', 'paypal', 'debit_card', 'crypto'])
+STATUSES = np.array(['completed', 'pending', 'failed'])
+EVENT_BUFFER_SIZE = 256
+
+def zipf_weights(n: int, skew: float) -> Optional[np.ndarray]:
+    if skew <= 0:
+        return None
+    weights = 1.0 / np.arange(1, n + 1) ** skew
+    return weights / weights.sum()
+
+def choice_weights(weights: Optional[Dict[str, float]], choices: np.ndarray) -> Optional[np.ndarray]:
+    if not weights:
+        return None
+    values = np.array([weights.get(choice, 0.0) for choice in choices], dtype=float)
+    return values / values.sum()
 
 class SalesSimulator:
-    def __init__(self):
+    def __init__(
+        self,
+        products: Optional[List[dict]] = None,
+        customers: Optional[List[dict]] = None,
+        status_weights: Optional[Dict[str, float]] = None,
+        payment_weights: Optional[Dict[str, float]] = None,
+        skew: Optional[float] = None,
+        seed: Optional[int] = None
+    ):
         self.transaction_counter = 0
-        self.products = self._load_products()
-        self.customers = self._load_customers()
+        self._buffered = []
+        self.rng = np.random.default_rng(seed)
+        products = products if products is not None else self._load_products()
+        customers = customers if customers is not None else self._load_customers()
+        
+        self.product_ids = np.array([product['product_id'] for product in products])
+        self.product_prices = np.array([float(product['price']) for product in products])
+        self.customer_ids = np.array([customer['customer_id'] for customer in customers])
+        
+        skew = settings.SIMULATOR_SKEW if skew is None else skew
+        self.product_weights = self._hot_set(zipf_weights(len(self.product_ids), skew))
+        self.customer_weights = self._hot_set(zipf_weights(len(self.customer_ids), skew))
+        self.status_weights = choice_weights(status_weights, STATUSES)
+        self.payment_weights = choice_weights(payment_weights, PAYMENT_METHODS)
     
-    def _load_products(self):
+    def _hot_set(self, weights: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        if weights is None:
+            return None
+        return weights[self.rng.permutation(len(weights))]
+    
+    def _load_json(self, path: str) -> list:
         try:
-            with open('data/products.json', 'r') as f:
+            with open(path, 'r') as f:
                 return json.load(f)
-        except:
+        except (OSError, ValueError) as e:
+            print(f"Warning: could not load {path} ({e}); using a synthetic catalog")
             return []
     
+    def _load_products(self):
+        products = self._load_json('data/products.json')
+        if products:
+            return products
+        prices = np.round(self.rng.uniform(10, 1000, size=100), 2)
+        return [{'product_id': f'PRD{i:05d}', 'price': price} for i, price in enumerate(prices.tolist())]
+    
     def _load_customers(self):
-        try:
-            with open('data/customers.json', 'r') as f:
-                return json.load(f)
-        except:
-            return []
+        customers = self._load_json('data/customers.json')
+        if customers:
+            return customers
+        return [{'customer_id': f'CUST{i:06d}'} for i in range(1000)]
     
-    def generate_event(self) -> dict:
-        self.transaction_counter += 1
-        product = random.choice(self.products)
-        customer = random.choice(self.customers)
-        quantity = random.randint(1, 5)
+    def generate_batch(self, n: int) -> List[dict]:
+        first = self.transaction_counter + 1
+        self.transaction_counter += n
+        
+        products = self.rng.choice(len(self.product_ids), size=n, p=self.product_weights)
+        customers = self.rng.choice(len(self.customer_ids), size=n, p=self.customer_weights)
+        quantities = self.rng.integers(1, 6, size=n)
+        prices = self.product_prices[products]
+        totals = np.round(prices * quantities, 2)
+        payments = self.rng.choice(len(PAYMENT_METHODS), size=n, p=self.payment_weights)
+        statuses = self.rng.choice(len(STATUSES), size=n, p=self.status_weights)
+        timestamp = datetime.utcnow().isoformat()
         
-        return {
-            'transaction_id': f'TXN{self.transaction_counter:08d}',
-            'timestamp': datetime.utcnow().isoformat(),
-            'customer_id': customer['customer_id'],
-            'product_id': product['product_id'],
-            'quantity': quantity,
-            'unit_price': product['price'],
-            'total_amount': round(product['price'] * quantity, 2),
-            'payment_method': random.choice(['credit_card', 'paypal', 'debit_card', 'crypto']),
-            'status': random.choice(['completed', 'pending', 'failed'])
-        }
+        return [
+            {
+                'transaction_id': f'TXN{number:08d}',
+                'timestamp': timestamp,
+                'customer_id': customer_id,
+                'product_id': product_id,
+                'quantity': quantity,
+                'unit_price': price,
+                'total_amount': total,
+                'payment_method': payment,
+                'status': status
+            }
+            for number, customer_id, product_id, quantity, price, total, payment, status in zip(
+                range(first, first + n),
+                self.customer_ids[customers].tolist(),
+                self.product_ids[products].tolist(),
+                quantities.tolist(),
+                prices.tolist(),
+                totals.tolist(),
+                PAYMENT_METHODS[payments].tolist(),
+                STATUSES[statuses].tolist()
+            )
+        ]
+    
+    def generate_event(self) -> dict:
+        if not self._buffered:
+            self._buffered = self.generate_batch(EVENT_BUFFER_SIZE)[::-1]
+        event = self._buffered.pop()
+        event['timestamp'] = datetime.utcnow().isoformat()
+        return event
 
 simulator = SalesSimulator()
 
@@ -65,26 +140,91 @@ async def root():
     return {
         "service": "Sales Stream API",
         "version": "1.0.0",
-        "endpoints": ["/stream", "/event", "/health"]
+        "endpoints": [
+            "/stream", "/event", "/events", "/health",
+            "/analytics/top-products", "/analytics/categories",
+            "/analytics/revenue", "/analytics/customers/{customer_id}/ltv"
+        ]
     }
 
 @app.get("/event")
 async def get_single_event():
     return simulator.generate_event()
 
+@app.get("/events")
+async def get_events(count: int = 100):
+    if not 1 <= count <= MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"count must be between 1 and {MAX_BATCH_SIZE}")
+    return Response(
+        orjson.dumps(simulator.generate_batch(count)),
+        media_type="application/json"
+    )
+
+def encode_frame(events: list, format: str) -> bytes:
+    if format == 'ndjson':
+        return b''.join(orjson.dumps(event, option=orjson.OPT_APPEND_NEWLINE) for event in events)
+    return b''.join(b'data: ' + orjson.dumps(event) + b'\n\n' for event in events)
+
+async def event_frames(rate: int, batch: int, format: str, limit: Optional[int] = None,
+                       bucket: Optional[TokenBucket] = None):
+    bucket = bucket or TokenBucket(rate, capacity=max(rate, batch))
+    sent = 0
+    while limit is None or sent < limit:
+        size = batch if limit is None else min(batch, limit - sent)
+        wait = bucket.take(size)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        else:
+            await asyncio.sleep(0)
+        
+        yield encode_frame(simulator.generate_batch(size), format)
+        sent += size
+
 @app.get("/stream")
-async def stream_events(rate: Optional[int] = 1):
-    async def event_generator():
-        while True:
-            event = simulator.generate_event()
-            yield f"data: {json.dumps(event)}\n\n"
-            await asyncio.sleep(1 / rate)
+async def stream_events(rate: int = 1, batch: int = 1, format: str = 'sse',
+                        limit: Optional[int] = None):
+    if format not in STREAM_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {sorted(STREAM_FORMATS)}")
+    if not 1 <= batch <= MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"batch must be between 1 and {MAX_BATCH_SIZE}")
     
     return StreamingResponse(
-        event_generator(),
-        media_type="text/event-stream"
+        event_frames(rate, batch, format, limit),
+        media_type=STREAM_FORMATS[format]
     )
 
+async def get_analytics():
+    async with get_async_session_factory()() as session:
+        yield AsyncDatabaseOperations(session)
+
+@app.get("/analytics/top-products")
+async def top_products(limit: int = 10, hours: Optional[int] = None,
+                       ops: AsyncDatabaseOperations = Depends(get_analytics)):
+    rows = await ops.get_top_products(limit, hours)
+    return [row._asdict() for row in rows]
+
+@app.get("/analytics/categories")
+async def sales_by_category(hours: Optional[int] = None,
+                            ops: AsyncDatabaseOperations = Depends(get_analytics)):
+    rows = await ops.get_sales_by_category(hours)
+    return [row._asdict() for row in rows]
+
+@app.get("/analytics/revenue")
+async def revenue_by_period(period: str = 'hour', hours: int = 24,
+                            ops: AsyncDatabaseOperations = Depends(get_analytics)):
+    if period not in ('hour', 'day'):
+        raise HTTPException(status_code=400, detail="period must be 'hour' or 'day'")
+    rows = await ops.get_revenue_by_period(period, hours)
+    return [row._asdict() for row in rows]
+
+@app.get("/analytics/customers/{customer_id}/ltv")
+async def customer_lifetime_value(customer_id: str,
+                                  ops: AsyncDatabaseOperations = Depends(get_analytics)):
+    return {
+        "customer_id": customer_id,
+        "lifetime_value": await ops.get_customer_lifetime_value(customer_id)
+    }
+
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    return {"status": "healthy", "pools": get_pool_stats()}
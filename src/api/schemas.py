@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from datetime import datetime
+
+class SalesEvent(BaseModel):
+    transaction_id: str
+    timestamp: datetime
+    customer_id: str
+    product_id: str
+    quantity: int
+    unit_price: float
+    total_amount: float
+    payment_method: str
+    status: str
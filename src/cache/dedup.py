@@ -0,0 +1,124 @@
+import hashlib
+from array import array
+from typing import Dict, Iterable, List, Optional
+import redis
+from config.settings import get_settings
+
+settings = get_settings()
+
+def fingerprint(transaction_id: str) -> int:
+    return int.from_bytes(hashlib.blake2b(transaction_id.encode('utf-8'), digest_size=8).digest(), 'little')
+
+class RecentIds:
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.mask = (1 << max(4, (2 * maxsize - 1).bit_length())) - 1
+        self._slots = array('Q', bytes(8 * (self.mask + 1)))
+        self._ring = array('Q', bytes(8 * maxsize))
+        self._next = 0
+        self._size = 0
+    
+    def _find(self, key: int) -> int:
+        slots, mask = self._slots, self.mask
+        index = key & mask
+        while slots[index] and slots[index] != key:
+            index = (index + 1) & mask
+        return index
+    
+    def _remove(self, key: int):
+        slots, mask = self._slots, self.mask
+        hole = self._find(key)
+        if slots[hole] != key:
+            return
+        slots[hole] = 0
+        index = hole
+        while True:
+            index = (index + 1) & mask
+            current = slots[index]
+            if not current:
+                return
+            if (index - (current & mask)) & mask >= (index - hole) & mask:
+                slots[hole] = current
+                slots[index] = 0
+                hole = index
+    
+    def __contains__(self, transaction_id: str) -> bool:
+        key = fingerprint(transaction_id) or 1
+        return self._slots[self._find(key)] == key
+    
+    def add(self, transaction_id: str):
+        key = fingerprint(transaction_id) or 1
+        if not self.maxsize or self._slots[self._find(key)] == key:
+            return
+        if self._size == self.maxsize:
+            self._remove(self._ring[self._next])
+        else:
+            self._size += 1
+        self._slots[self._find(key)] = key
+        self._ring[self._next] = key
+        self._next = (self._next + 1) % self.maxsize
+    
+    @property
+    def nbytes(self) -> int:
+        return self._slots.itemsize * len(self._slots) + self._ring.itemsize * len(self._ring)
+    
+    def __len__(self) -> int:
+        return self._size
+
+class Deduplicator:
+    def __init__(
+        self,
+        client: Optional[redis.Redis] = None,
+        maxsize: Optional[int] = None,
+        ttl: Optional[int] = None,
+        prefix: str = "dedup:txn:"
+    ):
+        self.client = client
+        self.recent = RecentIds(maxsize or settings.DEDUP_LOCAL_SIZE)
+        self.ttl = ttl or settings.DEDUP_TTL
+        self.prefix = prefix
+        self.stats = {'batch': 0, 'local': 0, 'redis': 0}
+    
+    def filter(self, transactions: List[Dict]) -> List[Dict]:
+        batch_ids = set()
+        candidates = []
+        for txn in transactions:
+            transaction_id = txn['transaction_id']
+            if transaction_id in batch_ids:
+                self.stats['batch'] += 1
+            elif transaction_id in self.recent:
+                self.stats['local'] += 1
+            else:
+                batch_ids.add(transaction_id)
+                candidates.append(txn)
+        
+        if self.client is None or not candidates:
+            return candidates
+        
+        try:
+            pipeline = self.client.pipeline(transaction=False)
+            for txn in candidates:
+                pipeline.exists(self.prefix + txn['transaction_id'])
+            seen = pipeline.execute()
+        except Exception as e:
+            print(f"Dedup lookup error: {e}")
+            return candidates
+        
+        fresh = [txn for txn, exists in zip(candidates, seen) if not exists]
+        self.stats['redis'] += len(candidates) - len(fresh)
+        return fresh
+    
+    def mark(self, transaction_ids: Iterable[str]):
+        transaction_ids = list(transaction_ids)
+        for transaction_id in transaction_ids:
+            self.recent.add(transaction_id)
+        
+        if self.client is None or not transaction_ids:
+            return
+        try:
+            pipeline = self.client.pipeline(transaction=False)
+            for transaction_id in transaction_ids:
+                pipeline.set(self.prefix + transaction_id, 1, ex=self.ttl)
+            pipeline.execute()
+        except Exception as e:
+            print(f"Dedup mark error: {e}")
@@ -0,0 +1,101 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import redis
+from config.settings import get_settings
+from config.resources import get_redis_client
+
+settings = get_settings()
+
+class LiveMetrics:
+    def __init__(self, client: Optional[redis.Redis] = None, prefix: str = "live:hour:",
+                 retention_hours: Optional[int] = None):
+        self.client = client or get_redis_client()
+        self.prefix = prefix
+        self.retention = timedelta(hours=retention_hours or settings.LIVE_METRICS_RETENTION_HOURS)
+    
+    def key(self, bucket: datetime) -> str:
+        return f"{self.prefix}{bucket:%Y-%m-%dT%H}"
+    
+    def record(self, rollups: Dict[tuple, List]):
+        buckets = defaultdict(lambda: defaultdict(float))
+        for (granularity, bucket, dimension, value, status), (count, quantity, revenue) in rollups.items():
+            if granularity != 'hour':
+                continue
+            fields = buckets[bucket]
+            completed = status == 'completed'
+            if dimension == 'all':
+                fields['count'] += count
+                fields[f'status:{status}'] += count
+                if completed:
+                    fields['completed'] += count
+                    fields['revenue'] += revenue
+                    fields['quantity'] += quantity
+            elif dimension == 'payment_method':
+                fields[f'payment:{value}'] += count
+            elif dimension == 'category' and completed:
+                fields[f'category:{value}'] += revenue
+                fields[f'category_count:{value}'] += count
+        
+        if not buckets:
+            return
+        try:
+            pipeline = self.client.pipeline(transaction=False)
+            for bucket, fields in buckets.items():
+                key = self.key(bucket)
+                for field, amount in fields.items():
+                    if field == 'revenue' or field.startswith('category:'):
+                        pipeline.hincrbyfloat(key, field, amount)
+                    else:
+                        pipeline.hincrby(key, field, int(amount))
+                pipeline.expireat(key, bucket + timedelta(hours=1) + self.retention)
+            pipeline.execute()
+        except Exception as e:
+            print(f"Live metrics update error: {e}")
+    
+    def snapshot(self, hours: int = 24, now: Optional[datetime] = None) -> Dict:
+        now = (now or datetime.utcnow()).replace(minute=0, second=0, microsecond=0)
+        buckets = [now - timedelta(hours=offset) for offset in range(hours - 1, -1, -1)]
+        
+        pipeline = self.client.pipeline(transaction=False)
+        for bucket in buckets:
+            pipeline.hgetall(self.key(bucket))
+        
+        totals = defaultdict(float)
+        hourly = []
+        groups = {'status': defaultdict(int), 'payment': defaultdict(int),
+                  'category': defaultdict(float), 'category_count': defaultdict(int)}
+        for bucket, fields in zip(buckets, pipeline.execute()):
+            row = {'hour': bucket, 'transaction_count': 0, 'revenue': 0.0}
+            for field, amount in fields.items():
+                field = field.decode() if isinstance(field, bytes) else field
+                amount = float(amount)
+                group, _, name = field.partition(':')
+                if name:
+                    groups[group][name] += amount
+                elif field == 'completed':
+                    row['transaction_count'] = int(amount)
+                elif field == 'revenue':
+                    row['revenue'] = amount
+                totals[field] += amount
+            hourly.append(row)
+        
+        count = totals['count']
+        completed = totals['completed']
+        status = dict(groups['status'])
+        return {
+            'total': int(count),
+            'completed': int(completed),
+            'failed': int(status.get('failed', 0)),
+            'pending': int(status.get('pending', 0)),
+            'revenue': totals['revenue'],
+            'avg_ticket': totals['revenue'] / completed if completed else 0.0,
+            'conversion_rate': completed / count * 100 if count else 0.0,
+            'hourly': hourly,
+            'status': status,
+            'payment_methods': dict(groups['payment']),
+            'categories': {
+                category: {'revenue': revenue, 'sales_count': int(groups['category_count'][category])}
+                for category, revenue in groups['category'].items()
+            },
+        }
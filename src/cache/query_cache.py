@@ -0,0 +1,85 @@
+import hashlib
+import inspect
+import json
+import threading
+from collections import namedtuple
+from datetime import datetime
+from decimal import Decimal
+from functools import wraps
+from typing import Any
+
+LOCK_STRIPES = 64
+QUERY_INDEX_KEY = 'query:index'
+_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+def _lock_for(key: str) -> threading.Lock:
+    return _locks[int(key[-8:], 16) % LOCK_STRIPES]
+
+def make_key(name: str, arguments: dict) -> str:
+    payload = json.dumps(arguments, default=str, sort_keys=True)
+    return f"query:{name}:{hashlib.sha1(payload.encode('utf-8')).hexdigest()}"
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and '__datetime__' in value:
+        return datetime.fromisoformat(value['__datetime__'])
+    return value
+
+def encode_result(result: Any) -> dict:
+    if isinstance(result, list) and all(hasattr(row, '_fields') for row in result):
+        return {
+            'fields': list(result[0]._fields) if result else [],
+            'rows': [[_encode_value(value) for value in row] for row in result]
+        }
+    return {'value': _encode_value(result)}
+
+def decode_result(payload: dict) -> Any:
+    if 'rows' in payload:
+        Row = namedtuple('Row', payload['fields'], rename=True)
+        return [Row(*[_decode_value(value) for value in row]) for row in payload['rows']]
+    return _decode_value(payload['value'])
+
+def invalidate_queries(cache) -> bool:
+    return cache.delete_index(QUERY_INDEX_KEY)
+
+def cached_query(ttl: int):
+    def decorator(func):
+        signature = inspect.signature(func)
+        
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            cache = getattr(self, 'cache', None)
+            if cache is None:
+                return func(self, *args, **kwargs)
+            
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            arguments.pop('self')
+            scope = getattr(self, 'cache_scope', None)
+            if scope:
+                arguments['__scope__'] = scope
+            key = make_key(func.__name__, arguments)
+            
+            cached = cache.get(key)
+            if cached is not None:
+                return decode_result(cached)
+            
+            with _lock_for(key):
+                cached = cache.get(key)
+                if cached is not None:
+                    return decode_result(cached)
+                
+                result = func(self, *args, **kwargs)
+                cache.set(key, encode_result(result), ttl)
+                cache.add_to_index(QUERY_INDEX_KEY, key)
+                return result
+        
+        return wrapper
+    return decorator
@@ -1,45 +1,147 @@
 import redis
 import json
-from typing import Optional, Any
+import threading
+import uuid
+from itertools import islice
+from typing import Optional, Any, Dict, Iterator, List
+from functools import lru_cache
 from config.settings import get_settings
+from config.resources import get_redis_client
+from src.cache.local_cache import LocalCache, MISSING
 
 settings = get_settings()
 
 class CacheManager:
-    def __init__(self):
-        self.client = redis.Redis(
-            host=settings.REDIS_HOST,
-            port=settings.REDIS_PORT,
-            db=settings.REDIS_DB,
-            decode_responses=True
-        )
+    def __init__(
+        self,
+        client: Optional[redis.Redis] = None,
+        local_cache_size: Optional[int] = None,
+        local_cache_ttl: Optional[int] = None
+    ):
+        self.client = client or get_redis_client()
         self.ttl = settings.REDIS_CACHE_TTL
+        self.stats = {'l1_hits': 0, 'l1_misses': 0, 'l2_hits': 0, 'l2_misses': 0}
+        self._stats_lock = threading.Lock()
+        
+        local_cache_size = settings.LOCAL_CACHE_SIZE if local_cache_size is None else local_cache_size
+        self.local = None
+        self._listener = None
+        if local_cache_size > 0:
+            self.local = LocalCache(local_cache_size, local_cache_ttl or settings.LOCAL_CACHE_TTL)
+            self.origin = uuid.uuid4().hex
+            self.channel = settings.CACHE_INVALIDATION_CHANNEL
+            self._subscribe_invalidations()
+    
+    def _subscribe_invalidations(self):
+        try:
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{self.channel: self._on_invalidation})
+            self._listener = pubsub.run_in_thread(sleep_time=0.5, daemon=True)
+        except Exception as e:
+            print(f"Cache invalidation subscribe error: {e}")
+    
+    def _on_invalidation(self, message):
+        origin, _, key = message['data'].partition('|')
+        if origin == self.origin:
+            return
+        if key == '*':
+            self.local.clear()
+        else:
+            self.local.delete(key)
+    
+    def _publish_invalidation(self, *keys: str):
+        if self.local is None:
+            return
+        try:
+            pipeline = self.client.pipeline(transaction=False)
+            for key in keys:
+                pipeline.publish(self.channel, f"{self.origin}|{key}")
+            pipeline.execute()
+        except Exception as e:
+            print(f"Cache invalidation publish error: {e}")
+    
+    def _count(self, name: str, amount: int = 1):
+        with self._stats_lock:
+            self.stats[name] += amount
+    
+    def get_stats(self) -> Dict[str, float]:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        for tier in ('l1', 'l2'):
+            lookups = stats[f'{tier}_hits'] + stats[f'{tier}_misses']
+            stats[f'{tier}_hit_rate'] = stats[f'{tier}_hits'] / lookups if lookups else 0.0
+        stats['l1_size'] = len(self.local) if self.local is not None else 0
+        return stats
     
     def get(self, key: str) -> Optional[Any]:
+        if self.local is not None:
+            value = self.local.get(key)
+            if value is not MISSING:
+                self._count('l1_hits')
+                return value
+            self._count('l1_misses')
+        
         try:
             value = self.client.get(key)
-            return json.loads(value) if value else None
+            value = json.loads(value) if value else None
         except Exception as e:
             print(f"Cache get error: {e}")
             return None
+        
+        if value is None:
+            self._count('l2_misses')
+            return None
+        
+        self._count('l2_hits')
+        if self.local is not None:
+            self.local.set(key, value)
+        return value
     
     def set(self, key: str, value: Any, ttl: Optional[int] = None):
         try:
             serialized = json.dumps(value)
             expire_time = ttl if ttl else self.ttl
             self.client.setex(key, expire_time, serialized)
-            return True
         except Exception as e:
             print(f"Cache set error: {e}")
             return False
+        
+        if self.local is not None:
+            self.local.set(key, value, expire_time)
+            self._publish_invalidation(key)
+        return True
     
     def delete(self, key: str):
         try:
             self.client.delete(key)
-            return True
         except Exception as e:
             print(f"Cache delete error: {e}")
             return False
+        
+        if self.local is not None:
+            self.local.delete(key)
+            self._publish_invalidation(key)
+        return True
+    
+    def add_to_index(self, index: str, key: str):
+        try:
+            self.client.sadd(index, key)
+        except Exception as e:
+            print(f"Cache index error: {e}")
+    
+    def delete_index(self, index: str) -> bool:
+        try:
+            keys = list(self.client.smembers(index))
+            self.client.delete(*keys, index)
+        except Exception as e:
+            print(f"Cache delete error: {e}")
+            return False
+        
+        if self.local is not None and keys:
+            for key in keys:
+                self.local.delete(key)
+            self._publish_invalidation(*keys)
+        return True
     
     def exists(self, key: str) -> bool:
         return self.client.exists(key) > 0
@@ -47,17 +149,81 @@ class CacheManager:
     def increment(self, key: str, amount: int = 1) -> int:
         return self.client.incrby(key, amount)
     
-    def get_metrics(self, pattern: str = "metric:*"):
-        keys = self.client.keys(pattern)
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        found = {}
+        remaining = list(keys)
+        if self.local is not None:
+            remaining = []
+            for key in keys:
+                value = self.local.get(key)
+                if value is MISSING:
+                    remaining.append(key)
+                else:
+                    found[key] = value
+            self._count('l1_hits', len(found))
+            self._count('l1_misses', len(remaining))
+        
+        if not remaining:
+            return found
+        try:
+            values = self.client.mget(remaining)
+        except Exception as e:
+            print(f"Cache get_many error: {e}")
+            return found
+        
+        fetched = {key: json.loads(value) for key, value in zip(remaining, values) if value}
+        self._count('l2_hits', len(fetched))
+        self._count('l2_misses', len(remaining) - len(fetched))
+        if self.local is not None:
+            for key, value in fetched.items():
+                self.local.set(key, value)
+        
+        found.update(fetched)
+        return found
+    
+    def set_many(self, mapping: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        if not mapping:
+            return True
+        try:
+            expire_time = ttl if ttl else self.ttl
+            pipeline = self.client.pipeline(transaction=False)
+            for key, value in mapping.items():
+                pipeline.setex(key, expire_time, json.dumps(value))
+                if self.local is not None:
+                    pipeline.publish(self.channel, f"{self.origin}|{key}")
+            pipeline.execute()
+        except Exception as e:
+            print(f"Cache set_many error: {e}")
+            return False
+        
+        if self.local is not None:
+            for key, value in mapping.items():
+                self.local.set(key, value, expire_time)
+        return True
+    
+    def scan_keys(self, pattern: str = "*", count: int = 500) -> Iterator[str]:
+        return self.client.scan_iter(match=pattern, count=count)
+    
+    def get_metrics(self, pattern: str = "metric:*", batch_size: int = 500):
         metrics = {}
-        for key in keys:
-            value = self.get(key)
-            if value:
-                metrics[key] = value
+        keys = self.scan_keys(pattern, count=batch_size)
+        while True:
+            batch = list(islice(keys, batch_size))
+            if not batch:
+                break
+            metrics.update(self.get_many(batch))
         return metrics
     
     def clear_all(self):
         self.client.flushdb()
+        if self.local is not None:
+            self.local.clear()
+            self._publish_invalidation('*')
+    
+    def close(self):
+        if self._listener is not None:
+            self._listener.stop()
 
+@lru_cache()
 def get_cache() -> CacheManager:
-    return CacheManager()
+    return CacheManager(client=get_redis_client())
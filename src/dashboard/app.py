@@ -1,9 +1,15 @@
+import time
+from contextlib import contextmanager
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from sqlalchemy import create_engine, text
+from src.cache.live_metrics import LiveMetrics
+from src.dashboard import data
 from src.cache.redis_manager import get_cache
 from config.settings import get_settings
+from config.resources import get_db_engine, get_pool_stats
+from src.database.models import get_session
+from src.database.operations import DatabaseOperations
 
 st.set_page_config(
     page_title="Sales Analytics Dashboard",
@@ -13,94 +19,108 @@ st.set_page_config(
 
 settings = get_settings()
 cache = get_cache()
+live_metrics = LiveMetrics(cache.client)
+timings = {}
 
-@st.cache_resource
-def get_db_engine():
-    return create_engine(settings.database_url)
-
+@st.cache_data(ttl=settings.DASHBOARD_CACHE_TTL, show_spinner=False)
 def load_recent_transactions(limit=100):
-    engine = get_db_engine()
-    query = text(f"""
-        SELECT * FROM transactions 
-        WHERE status = 'completed'
-        ORDER BY timestamp DESC 
-        LIMIT {limit}
-    """)
-    return pd.read_sql(query, engine)
-
-def load_sales_by_hour():
-    engine = get_db_engine()
-    query = text("""
-        SELECT 
-            DATE_TRUNC('hour', timestamp) as hour,
-            COUNT(*) as transaction_count,
-            SUM(total_amount) as revenue
-        FROM transactions
-        WHERE status = 'completed'
-        GROUP BY hour
-        ORDER BY hour DESC
-        LIMIT 24
-    """)
-    return pd.read_sql(query, engine)
+    return data.recent_transactions(get_db_engine(), limit)
+
+@st.cache_data(ttl=settings.DASHBOARD_CACHE_TTL, show_spinner=False)
+def load_sales_by_hour(hours=24):
+    return data.sales_by_hour(get_db_engine(), hours)
 
+@st.cache_data(ttl=settings.DASHBOARD_CACHE_TTL, show_spinner=False)
 def load_category_performance():
-    engine = get_db_engine()
-    query = text("""
-        SELECT 
-            p.category,
-            COUNT(t.transaction_id) as sales_count,
-            SUM(t.total_amount) as revenue
-        FROM transactions t
-        JOIN products p ON t.product_id = p.product_id
-        WHERE t.status = 'completed'
-        GROUP BY p.category
-        ORDER BY revenue DESC
-    """)
-    return pd.read_sql(query, engine)
+    return data.category_performance(get_db_engine())
+
+@st.cache_data(ttl=settings.DASHBOARD_CACHE_TTL, show_spinner=False)
+def load_payment_methods(hours=24):
+    return data.payment_methods(get_db_engine(), hours)
+
+@st.cache_data(ttl=settings.DASHBOARD_CACHE_TTL, show_spinner=False)
+def load_kpis(hours=24):
+    session = get_session(get_db_engine())
+    try:
+        return DatabaseOperations(session, cache=cache).get_kpis(hours)
+    finally:
+        session.close()
+
+@contextmanager
+def timed(panel):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[panel] = (time.perf_counter() - start) * 1000
+
+def load_live_metrics(hours=24):
+    snapshot = live_metrics.snapshot(hours)
+    kpis = {key: snapshot[key] for key in ('total', 'completed', 'failed', 'pending', 'revenue', 'avg_ticket', 'conversion_rate')}
+    df_hourly = pd.DataFrame(snapshot['hourly']).sort_values('hour', ascending=False)
+    payment_dist = pd.Series(snapshot['payment_methods'], dtype=float)
+    df_category = pd.DataFrame(
+        [{'category': category, **values} for category, values in snapshot['categories'].items()],
+        columns=['category', 'sales_count', 'revenue']
+    ).sort_values('revenue', ascending=False)
+    return kpis, df_hourly, payment_dist, df_category
+
+def load_payment_distribution(hours=24):
+    payments = load_payment_methods(hours)
+    return pd.Series(payments['transaction_count'].values, index=payments['payment_method'])
+
+def panel_sources(live_mode):
+    if not live_mode:
+        return {
+            'kpis': load_kpis,
+            'hourly': load_sales_by_hour,
+            'payments': load_payment_distribution,
+            'categories': load_category_performance,
+        }
+    with timed("Live snapshot"):
+        kpis, df_hourly, payment_dist, df_category = load_live_metrics()
+    return {
+        'kpis': lambda: kpis,
+        'hourly': lambda: df_hourly,
+        'payments': lambda: payment_dist,
+        'categories': lambda: df_category,
+    }
 
 st.title("Real-Time Sales Analytics Dashboard")
+live_mode = st.sidebar.toggle("Live mode (Redis)", value=False)
+if live_mode:
+    st.sidebar.caption(f"Refreshing every {settings.DASHBOARD_REFRESH_SECONDS}s from Redis counters")
 st.markdown("---")
 
 col1, col2, col3, col4 = st.columns(4)
 
 try:
-    df_recent = load_recent_transactions(1000)
-    
-    total_revenue = df_recent['total_amount'].sum()
-    total_transactions = len(df_recent)
-    avg_transaction = df_recent['total_amount'].mean()
+    sources = panel_sources(live_mode)
     
-    with col1:
-        st.metric("Total Revenue", f"${total_revenue:,.2f}")
-    
-    with col2:
-        st.metric("Transactions", f"{total_transactions:,}")
-    
-    with col3:
-        st.metric("Avg Transaction", f"${avg_transaction:.2f}")
-    
-    with col4:
-        conversion_rate = (df_recent['status'] == 'completed').mean() * 100
-        st.metric("Conversion Rate", f"{conversion_rate:.1f}%")
+    with timed("KPIs"):
+        kpis = sources['kpis']()
+        col1.metric("Total Revenue", f"${kpis['revenue']:,.2f}")
+        col2.metric("Transactions", f"{kpis['total']:,}")
+        col3.metric("Avg Transaction", f"${kpis['avg_ticket']:.2f}")
+        col4.metric("Conversion Rate", f"{kpis['conversion_rate']:.1f}%")
     
     st.markdown("---")
     
     col1, col2 = st.columns(2)
     
-    with col1:
+    with col1, timed("Revenue Over Time"):
         st.subheader("Revenue Over Time")
-        df_hourly = load_sales_by_hour()
         fig_revenue = px.line(
-            df_hourly,
+            sources['hourly'](),
             x='hour',
             y='revenue',
             title='Hourly Revenue Trend'
         )
         st.plotly_chart(fig_revenue, use_container_width=True)
     
-    with col2:
+    with col2, timed("Payment Methods"):
         st.subheader("Payment Methods")
-        payment_dist = df_recent['payment_method'].value_counts()
+        payment_dist = sources['payments']()
         fig_payment = px.pie(
             values=payment_dist.values,
             names=payment_dist.index,
@@ -112,22 +132,20 @@ try:
     
     col1, col2 = st.columns(2)
     
-    with col1:
+    with col1, timed("Category Performance"):
         st.subheader("Category Performance")
-        df_category = load_category_performance()
         fig_category = px.bar(
-            df_category,
+            sources['categories'](),
             x='category',
             y='revenue',
             title='Revenue by Category'
         )
         st.plotly_chart(fig_category, use_container_width=True)
     
-    with col2:
+    with col2, timed("Transaction Volume"):
         st.subheader("Transaction Volume")
-        df_hourly = load_sales_by_hour()
         fig_volume = px.bar(
-            df_hourly,
+            sources['hourly'](),
             x='hour',
             y='transaction_count',
             title='Transactions per Hour'
@@ -135,17 +153,42 @@ try:
         st.plotly_chart(fig_volume, use_container_width=True)
     
     st.markdown("---")
-    st.subheader("Recent Transactions")
-    st.dataframe(
-        df_recent.head(20),
-        use_container_width=True,
-        hide_index=True
-    )
+    with timed("Recent Transactions"):
+        st.subheader("Recent Transactions")
+        if live_mode:
+            st.caption("Recent transactions are read from PostgreSQL; switch off live mode to view them.")
+        else:
+            st.dataframe(
+                load_recent_transactions(20),
+                use_container_width=True,
+                hide_index=True
+            )
 
 except Exception as e:
     st.error(f"Error loading data: {e}")
-    st.info("Make sure the database is running and populated with data.")
+    if live_mode:
+        st.info("Make sure Redis is running and the consumer is writing live metrics.")
+    else:
+        st.info("Make sure the database is running and populated with data.")
+
+st.sidebar.subheader("Render Time")
+st.sidebar.dataframe(
+    pd.DataFrame({'panel': list(timings), 'ms': [round(ms, 1) for ms in timings.values()]}),
+    use_container_width=True,
+    hide_index=True
+)
+
+st.sidebar.subheader("Connection Pools")
+st.sidebar.dataframe(
+    pd.DataFrame.from_dict(get_pool_stats(), orient='index'),
+    use_container_width=True
+)
 
 if st.button("Refresh Data"):
+    st.cache_data.clear()
     st.cache_resource.clear()
     st.rerun()
+
+if live_mode:
+    time.sleep(settings.DASHBOARD_REFRESH_SECONDS)
+    st.rerun()
@@ -0,0 +1,63 @@
+import pandas as pd
+from datetime import datetime, timedelta
+from sqlalchemy import text
+
+RECENT_COLUMNS = [
+    'transaction_id', 'timestamp', 'customer_id', 'product_id',
+    'quantity', 'total_amount', 'payment_method', 'status'
+]
+
+def recent_transactions(engine, limit: int = 100) -> pd.DataFrame:
+    query = text(f"""
+        SELECT {', '.join(RECENT_COLUMNS)}
+        FROM transactions
+        WHERE status = 'completed'
+        ORDER BY timestamp DESC
+        LIMIT :limit
+    """)
+    return pd.read_sql(query, engine, params={'limit': int(limit)})
+
+def sales_by_hour(engine, hours: int = 24) -> pd.DataFrame:
+    query = text("""
+        SELECT 
+            bucket as hour,
+            transaction_count,
+            revenue
+        FROM sales_rollups
+        WHERE granularity = 'hour'
+          AND dimension = 'all'
+          AND status = 'completed'
+        ORDER BY bucket DESC
+        LIMIT :hours
+    """)
+    return pd.read_sql(query, engine, params={'hours': int(hours)})
+
+def category_performance(engine) -> pd.DataFrame:
+    query = text("""
+        SELECT 
+            dimension_value as category,
+            SUM(transaction_count) as sales_count,
+            SUM(revenue) as revenue
+        FROM sales_rollups
+        WHERE granularity = 'day'
+          AND dimension = 'category'
+          AND status = 'completed'
+        GROUP BY dimension_value
+        ORDER BY revenue DESC
+    """)
+    return pd.read_sql(query, engine)
+
+def payment_methods(engine, hours: int = 24) -> pd.DataFrame:
+    query = text("""
+        SELECT 
+            dimension_value as payment_method,
+            SUM(transaction_count) as transaction_count
+        FROM sales_rollups
+        WHERE granularity = 'hour'
+          AND dimension = 'payment_method'
+          AND bucket >= :since
+        GROUP BY dimension_value
+        ORDER BY transaction_count DESC
+    """)
+    since = (datetime.utcnow() - timedelta(hours=hours)).replace(minute=0, second=0, microsecond=0)
+    return pd.read_sql(query, engine, params={'since': since})
@@ -0,0 +1,37 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.database import queries
+from typing import Dict, Optional
+
+class AsyncDatabaseOperations:
+    def __init__(self, session: AsyncSession, use_rollups: bool = True):
+        self.session = session
+        self.use_rollups = use_rollups
+    
+    async def get_revenue_by_period(self, period: str = 'hour', hours: int = 24):
+        result = await self.session.execute(
+            queries.revenue_by_period(period, hours, self.use_rollups)
+        )
+        return result.all()
+    
+    async def get_top_products(self, limit: int = 10, hours: Optional[int] = None):
+        result = await self.session.execute(
+            queries.top_products(limit, hours, self.use_rollups)
+        )
+        return result.all()
+    
+    async def get_sales_by_category(self, hours: Optional[int] = None):
+        result = await self.session.execute(
+            queries.sales_by_category(hours, self.use_rollups)
+        )
+        return result.all()
+    
+    async def get_customer_lifetime_value(self, customer_id: str) -> float:
+        result = await self.session.scalar(queries.customer_lifetime_value(customer_id, self.use_rollups))
+        return float(result) if result else 0.0
+    
+    async def get_kpis(self, hours: Optional[int] = 24) -> Dict[str, float]:
+        result = await self.session.execute(queries.kpis(hours, self.use_rollups))
+        return queries.kpi_values(result.one())
+    
+    async def calculate_conversion_rate(self, hours: Optional[int] = None) -> float:
+        return (await self.get_kpis(hours))['conversion_rate']
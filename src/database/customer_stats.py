@@ -0,0 +1,83 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import delete, func
+from sqlalchemy.orm import Session
+from src.database import queries
+from src.database.loader import chunked
+from src.database.models import CustomerStats, dialect_insert
+
+STAT_COLUMNS = ['customer_id', 'lifetime_value', 'order_count', 'first_purchase', 'last_purchase']
+ROWS_PER_STATEMENT = 1000
+
+class CustomerStatsAggregator:
+    def __init__(self, session: Session):
+        self.session = session
+    
+    def _earliest(self, current, incoming):
+        if self.session.get_bind().dialect.name == 'postgresql':
+            return func.least(current, incoming)
+        return func.min(current, incoming)
+    
+    def _latest(self, current, incoming):
+        if self.session.get_bind().dialect.name == 'postgresql':
+            return func.greatest(current, incoming)
+        return func.max(current, incoming)
+    
+    def aggregate(self, transactions: List[Dict]) -> Dict[str, Dict]:
+        stats = defaultdict(lambda: {'lifetime_value': 0.0, 'order_count': 0,
+                                     'first_purchase': None, 'last_purchase': None})
+        for txn in transactions:
+            if txn.get('status') != 'completed':
+                continue
+            timestamp = txn['timestamp']
+            if isinstance(timestamp, str):
+                timestamp = datetime.fromisoformat(timestamp)
+            
+            entry = stats[txn['customer_id']]
+            entry['lifetime_value'] += txn['total_amount']
+            entry['order_count'] += 1
+            if entry['first_purchase'] is None or timestamp < entry['first_purchase']:
+                entry['first_purchase'] = timestamp
+            if entry['last_purchase'] is None or timestamp > entry['last_purchase']:
+                entry['last_purchase'] = timestamp
+        return stats
+    
+    def apply(self, transactions: List[Dict]):
+        rows = [dict(entry, customer_id=customer_id) for customer_id, entry in self.aggregate(transactions).items()]
+        for chunk in chunked(rows, ROWS_PER_STATEMENT):
+            stmt = dialect_insert(self.session, CustomerStats).values(chunk)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['customer_id'],
+                set_={
+                    'lifetime_value': CustomerStats.lifetime_value + stmt.excluded.lifetime_value,
+                    'order_count': CustomerStats.order_count + stmt.excluded.order_count,
+                    'first_purchase': self._earliest(CustomerStats.first_purchase, stmt.excluded.first_purchase),
+                    'last_purchase': self._latest(CustomerStats.last_purchase, stmt.excluded.last_purchase),
+                }
+            )
+            self.session.execute(stmt)
+    
+    def replace(self, customer_ids: Iterable[str]) -> int:
+        customer_ids = list(customer_ids)
+        for chunk in chunked(customer_ids, ROWS_PER_STATEMENT):
+            self.session.execute(delete(CustomerStats).where(CustomerStats.customer_id.in_(chunk)))
+            self.session.execute(
+                CustomerStats.__table__.insert().from_select(STAT_COLUMNS, queries.customer_values(chunk))
+            )
+        return len(customer_ids)
+    
+    def refresh(self, since: Optional[datetime] = None, customer_ids: Optional[Iterable[str]] = None) -> int:
+        if customer_ids is None:
+            customer_ids = self.session.scalars(queries.customers_with_transactions(since)).all()
+        count = self.replace(customer_ids)
+        self.session.commit()
+        return count
+    
+    def rebuild(self) -> int:
+        self.session.execute(delete(CustomerStats))
+        result = self.session.execute(
+            CustomerStats.__table__.insert().from_select(STAT_COLUMNS, queries.customer_values())
+        )
+        self.session.commit()
+        return result.rowcount
@@ -0,0 +1,79 @@
+import csv
+import io
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Sequence
+import pandas as pd
+from src.database.models import Transaction
+
+TRANSACTION_COLUMNS = [column.name for column in Transaction.__table__.columns]
+STAGING_TABLE = 'transactions_staging'
+
+def chunked(rows: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def rows_to_csv(rows: Iterable[Dict], columns: Sequence[str] = TRANSACTION_COLUMNS) -> io.StringIO:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    for row in rows:
+        writer.writerow(['' if row.get(column) is None else row.get(column) for column in columns])
+    buffer.seek(0)
+    return buffer
+
+def dataframe_to_csv(df: pd.DataFrame, columns: Sequence[str] = TRANSACTION_COLUMNS) -> io.StringIO:
+    buffer = io.StringIO()
+    df.to_csv(buffer, columns=list(columns), header=False, index=False, lineterminator='\n')
+    buffer.seek(0)
+    return buffer
+
+def copy_buffer(cursor, buffer: io.StringIO, table: str = 'transactions', columns: Sequence[str] = TRANSACTION_COLUMNS):
+    cursor.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+        buffer
+    )
+
+def primary_key_columns(cursor, table: str = 'transactions') -> List[str]:
+    cursor.execute("""
+        SELECT a.attname
+        FROM pg_index i
+        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+        WHERE i.indrelid = %s::regclass AND i.indisprimary
+    """, (table,))
+    return [row[0] for row in cursor.fetchall()]
+
+def upsert_buffer(cursor, buffer: io.StringIO, columns: Sequence[str] = TRANSACTION_COLUMNS):
+    primary_key = primary_key_columns(cursor)
+    key_columns = ', '.join(primary_key)
+    column_list = ', '.join(columns)
+    updates = ', '.join(f"{column} = EXCLUDED.{column}" for column in columns if column not in primary_key)
+
+    cursor.execute(
+        f"CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} "
+        f"(LIKE transactions INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+    )
+    copy_buffer(cursor, buffer, table=STAGING_TABLE, columns=columns)
+    cursor.execute(f"""
+        INSERT INTO transactions ({column_list})
+        SELECT DISTINCT ON ({key_columns}) {column_list}
+        FROM {STAGING_TABLE}
+        ORDER BY {key_columns}
+        ON CONFLICT ({key_columns}) DO UPDATE SET {updates}
+    """)
+
+def copy_rows(cursor, rows: Iterable[Dict], upsert: bool = False):
+    buffer = rows_to_csv(rows)
+    if upsert:
+        upsert_buffer(cursor, buffer)
+    else:
+        copy_buffer(cursor, buffer)
+
+def copy_dataframe(cursor, df: pd.DataFrame, upsert: bool = False):
+    buffer = dataframe_to_csv(df)
+    if upsert:
+        upsert_buffer(cursor, buffer)
+    else:
+        copy_buffer(cursor, buffer)
@@ -1,7 +1,11 @@
-from sqlalchemy import Column, String, Integer, Float, DateTime, create_engine
+from sqlalchemy import Column, String, Integer, Float, DateTime, Index, create_engine, inspect, text
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Optional
+from config.settings import get_settings
 
 Base = declarative_base()
 
@@ -36,6 +40,19 @@ class Transaction(Base):
     total_amount = Column(Float, nullable=False)
     payment_method = Column(String)
     status = Column(String)
+    
+    __table_args__ = (
+        Index('ix_transactions_timestamp', 'timestamp'),
+        Index('ix_transactions_customer_id', 'customer_id'),
+        Index('ix_transactions_product_id', 'product_id'),
+        Index('ix_transactions_status_timestamp', 'status', 'timestamp'),
+        Index(
+            'ix_transactions_completed_timestamp',
+            'timestamp',
+            postgresql_where=text("status = 'completed'"),
+            sqlite_where=text("status = 'completed'")
+        ),
+    )
 
 class SalesMetric(Base):
     __tablename__ = 'sales_metrics'
@@ -46,14 +63,65 @@ class SalesMetric(Base):
     metric_value = Column(Float, nullable=False)
     dimension = Column(String)
 
-def get_engine(database_url: str):
-    return create_engine(database_url)
+class SalesRollup(Base):
+    __tablename__ = 'sales_rollups'
+    
+    granularity = Column(String, primary_key=True)
+    bucket = Column(DateTime, primary_key=True)
+    dimension = Column(String, primary_key=True)
+    dimension_value = Column(String, primary_key=True)
+    status = Column(String, primary_key=True)
+    transaction_count = Column(Integer, nullable=False, default=0)
+    quantity = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0.0)
+
+class CustomerStats(Base):
+    __tablename__ = 'customer_stats'
+    
+    customer_id = Column(String, primary_key=True)
+    lifetime_value = Column(Float, nullable=False, default=0.0)
+    order_count = Column(Integer, nullable=False, default=0)
+    first_purchase = Column(DateTime)
+    last_purchase = Column(DateTime)
+
+def dialect_insert(session, model):
+    if session.get_bind().dialect.name == 'postgresql':
+        return postgresql.insert(model)
+    return sqlite.insert(model)
+
+def get_engine(database_url: str, **options):
+    return create_engine(database_url, **options)
+
+@lru_cache(maxsize=None)
+def get_session_factory(engine):
+    return sessionmaker(bind=engine)
 
 def get_session(engine):
-    SessionLocal = sessionmaker(bind=engine)
+    SessionLocal = get_session_factory(engine)
     return SessionLocal()
 
-def init_db(database_url: str):
-    engine = get_engine(database_url)
+def init_db(database_url: str, partition_interval: Optional[str] = None, engine=None):
+    engine = engine or get_engine(database_url)
+    partition_interval = partition_interval or get_settings().TRANSACTIONS_PARTITION_INTERVAL
+    if partition_interval and engine.dialect.name == 'postgresql':
+        from src.database.partitions import PartitionManager
+        
+        manager = PartitionManager(engine, partition_interval)
+        if inspect(engine).has_table('transactions') and not manager.is_partitioned():
+            raise RuntimeError(
+                "TRANSACTIONS_PARTITION_INTERVAL is set but 'transactions' already exists as a plain table; "
+                "rename it, run init_db to create the partitioned table, then copy the rows across "
+                "(or unset TRANSACTIONS_PARTITION_INTERVAL)"
+            )
+        manager.create_table()
+        manager.ensure_partitions(
+            start=datetime.utcnow() - timedelta(days=get_settings().TRANSACTIONS_RETENTION_DAYS)
+        )
     Base.metadata.create_all(engine)
+    create_missing_indexes(engine)
     return engine
+
+def create_missing_indexes(engine):
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
@@ -1,88 +1,196 @@
+import time
+import pandas as pd
+from itertools import islice
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
-from sqlalchemy import func, text
-from src.database.models import Transaction, Product, Customer, SalesMetric
+from src.database.models import Transaction, SalesMetric, dialect_insert
+from src.database.loader import chunked, copy_rows
+from src.database.partitions import PartitionManager
+from src.database import queries
+from src.database.rollups import RollupAggregator, bucket_start
+from src.database.customer_stats import CustomerStatsAggregator
+from src.cache.query_cache import cached_query, invalidate_queries
+from config.settings import get_settings
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import Iterable, Iterator, List, Dict, Optional, Sequence
+
+settings = get_settings()
 
 class DatabaseOperations:
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, use_rollups: bool = True, cache=None, live=None):
         self.session = session
+        self.use_rollups = use_rollups
+        self.cache = cache
+        self.live = live
+        self.rollups = RollupAggregator(session)
+        self.customer_stats = CustomerStatsAggregator(session)
+        self.partitions = None
+        self.invalidated_at = None
+    
+    @property
+    def cache_scope(self) -> Dict:
+        return {'use_rollups': self.use_rollups}
+    
+    def _partition_manager(self) -> Optional[PartitionManager]:
+        if self.session.bind.dialect.name != 'postgresql':
+            return None
+        if self.partitions is None:
+            manager = PartitionManager(self.session.get_bind())
+            self.partitions = manager if manager.is_partitioned() else False
+        return self.partitions or None
     
-    def bulk_insert_transactions(self, transactions: List[Dict]):
-        transaction_objects = [
-            Transaction(**txn) for txn in transactions
+    def _ensure_partitions(self, transactions: List[Dict]):
+        manager = self._partition_manager()
+        if manager is None or not transactions:
+            return
+        timestamps = [
+            datetime.fromisoformat(txn['timestamp']) if isinstance(txn['timestamp'], str) else txn['timestamp']
+            for txn in transactions
         ]
-        self.session.bulk_save_objects(transaction_objects)
+        manager.ensure_range(min(timestamps), max(timestamps))
+    
+    def _invalidate_queries(self, force: bool = True):
+        if self.cache is None:
+            return
+        now = time.monotonic()
+        if not force and self.invalidated_at is not None \
+                and now - self.invalidated_at < settings.QUERY_CACHE_INVALIDATION_INTERVAL:
+            return
+        invalidate_queries(self.cache)
+        self.invalidated_at = now
+    
+    def bulk_insert_transactions(self, transactions: List[Dict]) -> List[Dict]:
+        unique = {}
+        for txn in transactions:
+            unique.setdefault(txn['transaction_id'], txn)
+        if not unique:
+            return []
+        
+        self._ensure_partitions(list(unique.values()))
+        stmt = dialect_insert(self.session, Transaction)\
+            .on_conflict_do_nothing()\
+            .returning(Transaction.transaction_id)
+        inserted_ids = set(self.session.execute(stmt, list(unique.values())).scalars())
+        inserted = [txn for txn in unique.values() if txn['transaction_id'] in inserted_ids]
+        totals = self.rollups.apply(inserted)
+        self.customer_stats.apply(inserted)
         self.session.commit()
+        if inserted:
+            self._invalidate_queries(force=False)
+        if self.live is not None and totals:
+            self.live.record(totals)
+        return inserted
     
-    def get_recent_transactions(self, limit: int = 100) -> List[Transaction]:
-        return self.session.query(Transaction)\
-            .order_by(Transaction.timestamp.desc())\
-            .limit(limit)\
-            .all()
+    def copy_insert_transactions(self, transactions: Iterable[Dict], chunk_size: int = 50000, upsert: bool = False) -> int:
+        loaded = 0
+        for chunk in chunked(transactions, chunk_size):
+            if self.session.bind.dialect.name == 'postgresql':
+                self._ensure_partitions(chunk)
+                cursor = self.session.connection().connection.cursor()
+                copy_rows(cursor, chunk, upsert=upsert)
+                if not upsert:
+                    self.rollups.apply(chunk)
+                    self.customer_stats.apply(chunk)
+                self.session.commit()
+            elif upsert:
+                for txn in chunk:
+                    self.session.merge(Transaction(**txn))
+                self.session.commit()
+            else:
+                self.bulk_insert_transactions(chunk)
+            loaded += len(chunk)
+        
+        if upsert:
+            self.rollups.rebuild()
+            self.customer_stats.rebuild()
+        self._invalidate_queries()
+        return loaded
+    
+    def get_recent_transactions(self, limit: int = 100, columns: Optional[Sequence[str]] = None) -> List[Row]:
+        return self.session.execute(queries.recent_transactions(limit, columns)).all()
+    
+    def iter_transactions(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        columns: Optional[Sequence[str]] = None,
+        chunk_size: int = 10000
+    ) -> Iterator[Row]:
+        after = None
+        while True:
+            stmt = queries.transactions_page(after, start, end, columns, chunk_size)
+            result = self.session.execute(stmt.execution_options(stream_results=True, yield_per=chunk_size))
+            fetched = 0
+            for row in result:
+                fetched += 1
+                after = (row.timestamp, row.transaction_id)
+                yield row
+            if fetched < chunk_size:
+                return
     
+    def iter_transaction_frames(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        columns: Optional[Sequence[str]] = None,
+        chunk_size: int = 10000
+    ) -> Iterator[pd.DataFrame]:
+        rows = self.iter_transactions(start, end, columns, chunk_size)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return
+            frame = pd.DataFrame.from_records(chunk, columns=list(chunk[0]._fields))
+            yield frame[list(columns)] if columns else frame
+    
+    @cached_query(ttl=60)
     def get_revenue_by_period(self, period: str = 'hour', hours: int = 24):
-        if period == 'hour':
-            truncate = func.date_trunc('hour', Transaction.timestamp)
-        elif period == 'day':
-            truncate = func.date_trunc('day', Transaction.timestamp)
-        else:
-            truncate = Transaction.timestamp
-        
-        return self.session.query(
-            truncate.label('period'),
-            func.count(Transaction.transaction_id).label('count'),
-            func.sum(Transaction.total_amount).label('revenue')
-        ).filter(
-            Transaction.timestamp >= datetime.utcnow() - timedelta(hours=hours)
-        ).group_by('period').order_by('period').all()
-    
-    def get_top_products(self, limit: int = 10):
-        return self.session.query(
-            Product.name,
-            Product.category,
-            func.count(Transaction.transaction_id).label('sales_count'),
-            func.sum(Transaction.total_amount).label('revenue')
-        ).join(
-            Transaction,
-            Transaction.product_id == Product.product_id
-        ).group_by(
-            Product.name,
-            Product.category
-        ).order_by(
-            func.sum(Transaction.total_amount).desc()
-        ).limit(limit).all()
+        return self.session.execute(
+            queries.revenue_by_period(period, hours, self.use_rollups)
+        ).all()
+    
+    @cached_query(ttl=300)
+    def get_top_products(self, limit: int = 10, hours: Optional[int] = None):
+        return self.session.execute(
+            queries.top_products(limit, hours, self.use_rollups)
+        ).all()
     
     def get_customer_lifetime_value(self, customer_id: str) -> float:
-        result = self.session.query(
-            func.sum(Transaction.total_amount)
-        ).filter(
-            Transaction.customer_id == customer_id,
-            Transaction.status == 'completed'
+        result = self.session.execute(
+            queries.customer_lifetime_value(customer_id, self.use_rollups)
         ).scalar()
         
         return float(result) if result else 0.0
     
-    def calculate_conversion_rate(self) -> float:
-        total = self.session.query(Transaction).count()
-        completed = self.session.query(Transaction)\
-            .filter(Transaction.status == 'completed')\
-            .count()
-        
-        return (completed / total * 100) if total > 0 else 0.0
-    
-    def get_sales_by_category(self):
-        return self.session.query(
-            Product.category,
-            func.count(Transaction.transaction_id).label('count'),
-            func.sum(Transaction.total_amount).label('revenue')
-        ).join(
-            Transaction,
-            Transaction.product_id == Product.product_id
-        ).filter(
-            Transaction.status == 'completed'
-        ).group_by(
-            Product.category
+    def get_customer_lifetime_values(self, customer_ids: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+        stmt = queries.customer_stats(customer_ids) if self.use_rollups else queries.customer_values(customer_ids)
+        return {
+            row.customer_id: queries.customer_value_dict(row)
+            for row in self.session.execute(stmt)
+        }
+    
+    def refresh_customer_stats(self, since: Optional[datetime] = None) -> int:
+        if since is None:
+            return self.customer_stats.rebuild()
+        return self.customer_stats.refresh(since=since)
+    
+    def _kpis(self, hours: Optional[int]) -> Dict[str, float]:
+        return queries.kpi_values(self.session.execute(
+            queries.kpis(hours, self.use_rollups)
+        ).one())
+    
+    @cached_query(ttl=60)
+    def get_kpis(self, hours: Optional[int] = 24) -> Dict[str, float]:
+        return self._kpis(hours)
+    
+    @cached_query(ttl=60)
+    def calculate_conversion_rate(self, hours: Optional[int] = None) -> float:
+        return self._kpis(hours)['conversion_rate']
+    
+    @cached_query(ttl=300)
+    def get_sales_by_category(self, hours: Optional[int] = None):
+        return self.session.execute(
+            queries.sales_by_category(hours, self.use_rollups)
         ).all()
     
     def save_metric(self, metric_name: str, metric_value: float, dimension: Optional[str] = None):
@@ -96,8 +204,18 @@ class DatabaseOperations:
         self.session.commit()
     
     def cleanup_old_data(self, days: int = 30):
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
+        cutoff_date = bucket_start(datetime.utcnow() - timedelta(days=days), 'day')
+        expired_customers = self.session.scalars(queries.customers_with_transactions(until=cutoff_date)).all()
+        if self.session.bind.dialect.name == 'postgresql':
+            self.session.commit()
+            partitions = self._partition_manager()
+            if partitions is not None:
+                partitions.drop_partitions_before(cutoff_date)
+        
         self.session.query(Transaction)\
             .filter(Transaction.timestamp < cutoff_date)\
             .delete()
+        self.rollups.delete_before(cutoff_date)
+        self.customer_stats.replace(expired_customers)
         self.session.commit()
+        self._invalidate_queries()
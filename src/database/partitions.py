@@ -0,0 +1,169 @@
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from sqlalchemy import delete, text
+from sqlalchemy.schema import CreateColumn
+from src.database.models import SalesRollup, Transaction
+from config.settings import get_settings
+
+settings = get_settings()
+
+PARENT_TABLE = 'transactions'
+NAME_FORMATS = {
+    'day': '%Y%m%d',
+    'month': '%Y%m',
+}
+
+def floor_bound(moment: datetime, interval: str) -> datetime:
+    if interval == 'day':
+        return datetime(moment.year, moment.month, moment.day)
+    if interval == 'month':
+        return datetime(moment.year, moment.month, 1)
+    raise ValueError(f"Unsupported partition interval: {interval}")
+
+def next_bound(bound: datetime, interval: str) -> datetime:
+    if interval == 'day':
+        return bound + timedelta(days=1)
+    if bound.month == 12:
+        return datetime(bound.year + 1, 1, 1)
+    return datetime(bound.year, bound.month + 1, 1)
+
+def partition_name(bound: datetime, interval: str) -> str:
+    return f"{PARENT_TABLE}_p{bound.strftime(NAME_FORMATS[interval])}"
+
+def parse_partition_name(name: str) -> Optional[Tuple[datetime, datetime]]:
+    suffix = name[len(f"{PARENT_TABLE}_p"):]
+    for interval, name_format in NAME_FORMATS.items():
+        if len(suffix) == len(datetime(2000, 1, 1).strftime(name_format)):
+            try:
+                lower = datetime.strptime(suffix, name_format)
+            except ValueError:
+                continue
+            return lower, next_bound(lower, interval)
+    return None
+
+def create_table_ddl(dialect) -> str:
+    columns = ',\n    '.join(
+        str(CreateColumn(column).compile(dialect=dialect))
+        for column in Transaction.__table__.columns
+    )
+    return (
+        f"CREATE TABLE IF NOT EXISTS {PARENT_TABLE} (\n    {columns},\n"
+        f"    PRIMARY KEY (transaction_id, timestamp)\n) PARTITION BY RANGE (timestamp)"
+    )
+
+class PartitionManager:
+    def __init__(self, engine, interval: Optional[str] = None):
+        self.engine = engine
+        self.interval = interval or settings.TRANSACTIONS_PARTITION_INTERVAL
+        self.covered = None
+    
+    def is_partitioned(self) -> bool:
+        with self.engine.connect() as connection:
+            return connection.execute(text("""
+                SELECT EXISTS (
+                    SELECT 1 FROM pg_partitioned_table pt
+                    JOIN pg_class c ON c.oid = pt.partrelid
+                    WHERE c.relname = :table
+                )
+            """), {'table': PARENT_TABLE}).scalar()
+    
+    def create_table(self):
+        with self.engine.begin() as connection:
+            connection.execute(text(create_table_ddl(self.engine.dialect)))
+    
+    def _create_partition(self, connection, bound: datetime) -> str:
+        upper = next_bound(bound, self.interval)
+        name = partition_name(bound, self.interval)
+        connection.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT_TABLE} "
+            f"FOR VALUES FROM ('{bound.isoformat()}') TO ('{upper.isoformat()}')"
+        ))
+        if self.covered is not None:
+            self.covered.add(bound)
+        return name
+    
+    def ensure_partitions(self, start: Optional[datetime] = None, ahead: Optional[int] = None) -> List[str]:
+        ahead = ahead if ahead is not None else settings.TRANSACTIONS_PARTITIONS_AHEAD
+        now = floor_bound(datetime.utcnow(), self.interval)
+        bound = floor_bound(start, self.interval) if start else now
+        
+        last = now
+        for _ in range(ahead):
+            last = next_bound(last, self.interval)
+        
+        created = []
+        with self.engine.begin() as connection:
+            while bound <= last:
+                created.append(self._create_partition(connection, bound))
+                bound = next_bound(bound, self.interval)
+        return created
+    
+    def ensure_range(self, start: datetime, end: datetime) -> List[str]:
+        if self.covered is None:
+            self.covered = {lower for _, lower, _ in self.list_partitions()}
+        
+        missing = []
+        bound = floor_bound(start, self.interval)
+        while bound <= end:
+            if bound not in self.covered:
+                missing.append(bound)
+            bound = next_bound(bound, self.interval)
+        if not missing:
+            return []
+        
+        with self.engine.begin() as connection:
+            return [self._create_partition(connection, bound) for bound in missing]
+    
+    def list_partitions(self) -> List[Tuple[str, datetime, datetime]]:
+        with self.engine.connect() as connection:
+            names = connection.execute(text("""
+                SELECT child.relname
+                FROM pg_inherits i
+                JOIN pg_class child ON child.oid = i.inhrelid
+                JOIN pg_class parent ON parent.oid = i.inhparent
+                WHERE parent.relname = :table
+            """), {'table': PARENT_TABLE}).scalars().all()
+        
+        partitions = []
+        for name in names:
+            bounds = parse_partition_name(name)
+            if bounds:
+                partitions.append((name, *bounds))
+        return sorted(partitions, key=lambda partition: partition[1])
+    
+    def drop_partitions_before(self, cutoff: datetime) -> List[str]:
+        dropped = []
+        for name, lower, upper in self.list_partitions():
+            if upper > cutoff:
+                continue
+            with self.engine.begin() as connection:
+                connection.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+                connection.execute(text(f"DROP TABLE {name}"))
+                connection.execute(delete(SalesRollup).where(SalesRollup.bucket < upper))
+            if self.covered is not None:
+                self.covered.discard(lower)
+            dropped.append(name)
+        return dropped
+
+def main():
+    from src.database.models import get_engine, get_session
+    from src.database.operations import DatabaseOperations
+    
+    engine = get_engine(settings.database_url)
+    manager = PartitionManager(engine)
+    if not manager.is_partitioned():
+        print(f"Table '{PARENT_TABLE}' is not partitioned; nothing to maintain")
+        return
+    
+    created = manager.ensure_partitions()
+    before = {name for name, _, _ in manager.list_partitions()}
+    session = get_session(engine)
+    try:
+        DatabaseOperations(session).cleanup_old_data(settings.TRANSACTIONS_RETENTION_DAYS)
+    finally:
+        session.close()
+    dropped = sorted(before - {name for name, _, _ in manager.list_partitions()})
+    print(f"Ensured {len(created)} partitions, dropped {len(dropped)}: {', '.join(dropped) or 'none'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.sql import Select
+from src.database.models import CustomerStats, Transaction, Product, SalesRollup
+from src.database.rollups import bucket_start
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+def within(stmt: Select, hours: Optional[int]) -> Select:
+    if hours is None:
+        return stmt
+    return stmt.where(Transaction.timestamp >= datetime.utcnow() - timedelta(hours=hours))
+
+def rollups_within(stmt: Select, hours: Optional[int]) -> Select:
+    if hours is None:
+        return stmt.where(SalesRollup.granularity == 'day')
+    cutoff = bucket_start(datetime.utcnow() - timedelta(hours=hours), 'hour')
+    return stmt.where(SalesRollup.granularity == 'hour', SalesRollup.bucket >= cutoff)
+
+def revenue_by_period(period: str = 'hour', hours: int = 24, use_rollups: bool = True) -> Select:
+    if use_rollups and period in ('hour', 'day'):
+        cutoff = bucket_start(datetime.utcnow() - timedelta(hours=hours), period)
+        return select(
+            SalesRollup.bucket.label('period'),
+            func.sum(SalesRollup.transaction_count).label('count'),
+            func.sum(SalesRollup.revenue).label('revenue')
+        ).where(
+            SalesRollup.granularity == period,
+            SalesRollup.dimension == 'all',
+            SalesRollup.bucket >= cutoff
+        ).group_by(SalesRollup.bucket).order_by(SalesRollup.bucket)
+    
+    if period == 'hour':
+        truncate = func.date_trunc('hour', Transaction.timestamp)
+    elif period == 'day':
+        truncate = func.date_trunc('day', Transaction.timestamp)
+    else:
+        truncate = Transaction.timestamp
+    
+    return select(
+        truncate.label('period'),
+        func.count(Transaction.transaction_id).label('count'),
+        func.sum(Transaction.total_amount).label('revenue')
+    ).where(
+        Transaction.timestamp >= datetime.utcnow() - timedelta(hours=hours)
+    ).group_by('period').order_by('period')
+
+def top_products(limit: int = 10, hours: Optional[int] = None, use_rollups: bool = True) -> Select:
+    if use_rollups:
+        stmt = select(
+            Product.name,
+            Product.category,
+            func.sum(SalesRollup.transaction_count).label('sales_count'),
+            func.sum(SalesRollup.revenue).label('revenue')
+        ).join(
+            SalesRollup,
+            SalesRollup.dimension_value == Product.product_id
+        ).where(
+            SalesRollup.dimension == 'product'
+        )
+        
+        return rollups_within(stmt, hours).group_by(
+            Product.name,
+            Product.category
+        ).order_by(
+            func.sum(SalesRollup.revenue).desc()
+        ).limit(limit)
+    
+    stmt = select(
+        Product.name,
+        Product.category,
+        func.count(Transaction.transaction_id).label('sales_count'),
+        func.sum(Transaction.total_amount).label('revenue')
+    ).join(
+        Transaction,
+        Transaction.product_id == Product.product_id
+    )
+    
+    return within(stmt, hours).group_by(
+        Product.name,
+        Product.category
+    ).order_by(
+        func.sum(Transaction.total_amount).desc()
+    ).limit(limit)
+
+def sales_by_category(hours: Optional[int] = None, use_rollups: bool = True) -> Select:
+    if use_rollups:
+        stmt = select(
+            SalesRollup.dimension_value.label('category'),
+            func.sum(SalesRollup.transaction_count).label('count'),
+            func.sum(SalesRollup.revenue).label('revenue')
+        ).where(
+            SalesRollup.dimension == 'category',
+            SalesRollup.status == 'completed'
+        )
+        
+        return rollups_within(stmt, hours).group_by(SalesRollup.dimension_value)
+    
+    stmt = select(
+        Product.category,
+        func.count(Transaction.transaction_id).label('count'),
+        func.sum(Transaction.total_amount).label('revenue')
+    ).join(
+        Transaction,
+        Transaction.product_id == Product.product_id
+    ).where(
+        Transaction.status == 'completed'
+    )
+    
+    return within(stmt, hours).group_by(Product.category)
+
+def kpis(hours: Optional[int] = 24, use_rollups: bool = True) -> Select:
+    if use_rollups:
+        count, status, amount = SalesRollup.transaction_count, SalesRollup.status, SalesRollup.revenue
+        total = func.sum(count)
+        per_status = lambda name: func.sum(count).filter(status == name)
+    else:
+        status, amount = Transaction.status, Transaction.total_amount
+        total = func.count()
+        per_status = lambda name: func.count().filter(status == name)
+    
+    stmt = select(
+        func.coalesce(total, 0).label('total'),
+        func.coalesce(per_status('completed'), 0).label('completed'),
+        func.coalesce(per_status('failed'), 0).label('failed'),
+        func.coalesce(per_status('pending'), 0).label('pending'),
+        func.coalesce(func.sum(amount).filter(status == 'completed'), 0).label('revenue')
+    )
+    if use_rollups:
+        return rollups_within(stmt.where(SalesRollup.dimension == 'all'), hours)
+    return within(stmt, hours)
+
+def kpi_values(row) -> Dict[str, float]:
+    values = {
+        'total': int(row.total),
+        'completed': int(row.completed),
+        'failed': int(row.failed),
+        'pending': int(row.pending),
+        'revenue': float(row.revenue),
+    }
+    values['avg_ticket'] = values['revenue'] / values['completed'] if values['completed'] else 0.0
+    values['conversion_rate'] = values['completed'] / values['total'] * 100 if values['total'] else 0.0
+    return values
+
+def customer_lifetime_value(customer_id: str, use_stats: bool = True) -> Select:
+    if use_stats:
+        return select(CustomerStats.lifetime_value).where(CustomerStats.customer_id == customer_id)
+    
+    return select(
+        func.sum(Transaction.total_amount)
+    ).where(
+        Transaction.customer_id == customer_id,
+        Transaction.status == 'completed'
+    )
+
+def customer_values(customer_ids: Optional[Iterable[str]] = None) -> Select:
+    stmt = select(
+        Transaction.customer_id,
+        func.sum(Transaction.total_amount).label('lifetime_value'),
+        func.count().label('order_count'),
+        func.min(Transaction.timestamp).label('first_purchase'),
+        func.max(Transaction.timestamp).label('last_purchase')
+    ).where(
+        Transaction.status == 'completed'
+    )
+    if customer_ids is not None:
+        stmt = stmt.where(Transaction.customer_id.in_(list(customer_ids)))
+    return stmt.group_by(Transaction.customer_id)
+
+def customers_with_transactions(since: Optional[datetime] = None, until: Optional[datetime] = None) -> Select:
+    stmt = select(Transaction.customer_id).where(Transaction.customer_id.is_not(None))
+    if since is not None:
+        stmt = stmt.where(Transaction.timestamp >= since)
+    if until is not None:
+        stmt = stmt.where(Transaction.timestamp < until)
+    return stmt.distinct()
+
+def customer_stats(customer_ids: Optional[Iterable[str]] = None) -> Select:
+    stmt = select(
+        CustomerStats.customer_id,
+        CustomerStats.lifetime_value,
+        CustomerStats.order_count,
+        CustomerStats.first_purchase,
+        CustomerStats.last_purchase
+    )
+    if customer_ids is not None:
+        stmt = stmt.where(CustomerStats.customer_id.in_(list(customer_ids)))
+    return stmt
+
+def customer_value_dict(row) -> Dict:
+    return {
+        'customer_id': row.customer_id,
+        'lifetime_value': float(row.lifetime_value or 0.0),
+        'order_count': int(row.order_count or 0),
+        'first_purchase': row.first_purchase,
+        'last_purchase': row.last_purchase,
+        'avg_order_value': float(row.lifetime_value) / row.order_count if row.order_count else 0.0,
+    }
+
+def transaction_columns(columns: Optional[Sequence[str]] = None) -> List:
+    table = Transaction.__table__
+    return [table.c[name] for name in columns] if columns else list(table.c)
+
+def recent_transactions(limit: int = 100, columns: Optional[Sequence[str]] = None) -> Select:
+    return select(*transaction_columns(columns))\
+        .order_by(Transaction.timestamp.desc(), Transaction.transaction_id.desc())\
+        .limit(limit)
+
+def transactions_page(
+    after: Optional[Tuple[datetime, str]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    columns: Optional[Sequence[str]] = None,
+    limit: int = 10000
+) -> Select:
+    names = list(columns) if columns else [column.name for column in Transaction.__table__.c]
+    for key in ('timestamp', 'transaction_id'):
+        if key not in names:
+            names.append(key)
+    
+    stmt = select(*transaction_columns(names))
+    if start is not None:
+        stmt = stmt.where(Transaction.timestamp >= start)
+    if end is not None:
+        stmt = stmt.where(Transaction.timestamp < end)
+    if after is not None:
+        stmt = stmt.where(tuple_(Transaction.timestamp, Transaction.transaction_id) > tuple_(*after))
+    return stmt.order_by(Transaction.timestamp, Transaction.transaction_id).limit(limit)
@@ -0,0 +1,135 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import func, literal, select, delete
+from sqlalchemy.orm import Session
+from src.database.models import Product, SalesRollup, Transaction, dialect_insert
+from src.database.loader import chunked
+
+GRANULARITIES = ('hour', 'day')
+DIMENSIONS = ('all', 'category', 'product', 'payment_method')
+KEY_COLUMNS = ['granularity', 'bucket', 'dimension', 'dimension_value', 'status']
+ROWS_PER_STATEMENT = 1000
+
+def bucket_start(timestamp: datetime, granularity: str) -> datetime:
+    if granularity == 'hour':
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+class RollupAggregator:
+    def __init__(self, session: Session):
+        self.session = session
+        self._categories: Dict[str, Optional[str]] = {}
+    
+    def _product_categories(self, product_ids: Iterable[str]) -> Dict[str, Optional[str]]:
+        missing = {product_id for product_id in product_ids if product_id not in self._categories}
+        if missing:
+            rows = self.session.query(Product.product_id, Product.category)\
+                .filter(Product.product_id.in_(missing))\
+                .all()
+            self._categories.update(rows)
+        return self._categories
+    
+    def aggregate(self, transactions: List[Dict]) -> Dict[tuple, List]:
+        categories = self._product_categories(txn['product_id'] for txn in transactions)
+        totals = defaultdict(lambda: [0, 0, 0.0])
+        
+        for txn in transactions:
+            timestamp = txn['timestamp']
+            if isinstance(timestamp, str):
+                timestamp = datetime.fromisoformat(timestamp)
+            
+            dimensions = [
+                ('all', ''),
+                ('product', txn['product_id']),
+                ('payment_method', txn.get('payment_method') or ''),
+            ]
+            category = categories.get(txn['product_id'])
+            if category is not None:
+                dimensions.append(('category', category))
+            
+            status = txn.get('status') or ''
+            for granularity in GRANULARITIES:
+                bucket = bucket_start(timestamp, granularity)
+                for dimension, value in dimensions:
+                    entry = totals[(granularity, bucket, dimension, value, status)]
+                    entry[0] += 1
+                    entry[1] += txn['quantity']
+                    entry[2] += txn['total_amount']
+        
+        return totals
+    
+    def apply(self, transactions: List[Dict]) -> Dict[tuple, List]:
+        if not transactions:
+            return {}
+        
+        totals = self.aggregate(transactions)
+        rows = [
+            dict(zip(KEY_COLUMNS, key), transaction_count=count, quantity=quantity, revenue=revenue)
+            for key, (count, quantity, revenue) in totals.items()
+        ]
+        for chunk in chunked(rows, ROWS_PER_STATEMENT):
+            stmt = dialect_insert(self.session, SalesRollup).values(chunk)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=KEY_COLUMNS,
+                set_={
+                    'transaction_count': SalesRollup.transaction_count + stmt.excluded.transaction_count,
+                    'quantity': SalesRollup.quantity + stmt.excluded.quantity,
+                    'revenue': SalesRollup.revenue + stmt.excluded.revenue,
+                }
+            )
+            self.session.execute(stmt)
+        return totals
+    
+    def delete_before(self, cutoff: datetime) -> int:
+        return self.session.execute(delete(SalesRollup).where(SalesRollup.bucket < cutoff)).rowcount
+    
+    def rebuild(self, chunk_size: int = 50000):
+        self.session.execute(delete(SalesRollup))
+        
+        if self.session.get_bind().dialect.name == 'postgresql':
+            for granularity in GRANULARITIES:
+                for dimension in DIMENSIONS:
+                    self.session.execute(
+                        SalesRollup.__table__.insert().from_select(
+                            KEY_COLUMNS + ['transaction_count', 'quantity', 'revenue'],
+                            self._rollup_select(granularity, dimension)
+                        )
+                    )
+        else:
+            query = self.session.query(*Transaction.__table__.columns).yield_per(chunk_size)
+            batch = []
+            for row in query:
+                batch.append(row._asdict())
+                if len(batch) >= chunk_size:
+                    self.apply(batch)
+                    batch = []
+            self.apply(batch)
+        
+        self.session.commit()
+    
+    def _rollup_select(self, granularity: str, dimension: str):
+        bucket = func.date_trunc(granularity, Transaction.timestamp)
+        status = func.coalesce(Transaction.status, '')
+        values = {
+            'all': literal(''),
+            'product': Transaction.product_id,
+            'payment_method': func.coalesce(Transaction.payment_method, ''),
+            'category': Product.category,
+        }
+        
+        stmt = select(
+            literal(granularity),
+            bucket,
+            literal(dimension),
+            values[dimension],
+            status,
+            func.count(),
+            func.sum(Transaction.quantity),
+            func.sum(Transaction.total_amount)
+        )
+        if dimension == 'category':
+            stmt = stmt.join(Product, Product.product_id == Transaction.product_id)
+        if dimension == 'all':
+            return stmt.group_by(bucket, status)
+        return stmt.group_by(bucket, values[dimension], status)
@@ -1,26 +1,34 @@
 from kafka import KafkaConsumer
-import json
+from config.resources import get_db_engine, get_redis_client
 from config.settings import get_settings
+from src.cache.dedup import Deduplicator
+from src.cache.live_metrics import LiveMetrics
+from src.cache.redis_manager import get_cache
+from src.database.models import init_db, get_session
+from src.database.operations import DatabaseOperations
+from src.kafka.serializers import decode_message
+from src.kafka.sink import TransactionSink
 
 settings = get_settings()
 
 class SalesConsumer:
-    def __init__(self, group_id: str = "sales-analytics-group"):
-        self.consumer = KafkaConsumer(
-            settings.KAFKA_TOPIC_SALES,
-            bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS,
-            auto_offset_reset='earliest',
-            enable_auto_commit=True,
-            group_id=group_id,
-            value_deserializer=lambda m: json.loads(m.decode('utf-8'))
-        )
+    def __init__(self, group_id: str = "sales-analytics-group", enable_auto_commit: bool = True, consumer=None, listener=None):
+        if consumer is None:
+            consumer = KafkaConsumer(
+                bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS,
+                auto_offset_reset='earliest',
+                enable_auto_commit=enable_auto_commit,
+                group_id=group_id
+            )
+            consumer.subscribe([settings.KAFKA_TOPIC_SALES], listener=listener)
+        self.consumer = consumer
     
     def consume(self, callback=None):
         print(f"Starting consumer... Listening to {settings.KAFKA_TOPIC_SALES}")
         
         try:
             for message in self.consumer:
-                event = message.value
+                event = decode_message(message)
                 print(f"Consumed: {event['transaction_id']} - ${event['total_amount']}")
                 
                 if callback:
@@ -30,10 +38,41 @@ class SalesConsumer:
             print("\nShutting down consumer...")
         finally:
             self.consumer.close()
+    
+    def consume_to_sink(self, sink: TransactionSink, poll_timeout_ms: int = 500, stop_event=None, reporter=None):
+        print(f"Starting consumer... Writing {settings.KAFKA_TOPIC_SALES} to PostgreSQL in batches of {sink.batch_size}")
+        
+        try:
+            while stop_event is None or not stop_event.is_set():
+                records = self.consumer.poll(timeout_ms=poll_timeout_ms, max_records=sink.batch_size)
+                for messages in records.values():
+                    for message in messages:
+                        sink.add(decode_message(message))
+                
+                if sink.should_flush():
+                    self._flush_and_commit(sink)
+                if reporter:
+                    reporter()
+            
+            self._flush_and_commit(sink)
+        
+        except KeyboardInterrupt:
+            print("\nShutting down consumer...")
+            self._flush_and_commit(sink)
+        finally:
+            self.consumer.close(autocommit=False)
+    
+    def _flush_and_commit(self, sink: TransactionSink):
+        count = sink.flush()
+        if count:
+            self.consumer.commit()
+            print(f"Committed batch of {count} events ({sink.written} total)")
 
 def main():
-    consumer = SalesConsumer()
-    consumer.consume()
+    engine = init_db(settings.database_url, engine=get_db_engine())
+    ops = DatabaseOperations(get_session(engine), cache=get_cache(), live=LiveMetrics())
+    consumer = SalesConsumer(enable_auto_commit=False)
+    consumer.consume_to_sink(TransactionSink(ops, dedup=Deduplicator(get_redis_client())))
 
 if __name__ == "__main__":
     main()
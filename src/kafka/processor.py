@@ -0,0 +1,218 @@
+import argparse
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+from kafka import KafkaConsumer
+from config.settings import get_settings
+from src.cache.redis_manager import CacheManager
+from src.kafka.producer import SalesProducer
+from src.kafka.serializers import decode_message
+from src.kafka.sink import event_to_transaction
+
+settings = get_settings()
+
+EPOCH = datetime(1970, 1, 1)
+
+def window_starts(timestamp: datetime, size: timedelta, slide: timedelta) -> List[datetime]:
+    last = EPOCH + ((timestamp - EPOCH) // slide) * slide
+    starts = []
+    start = last
+    while start > timestamp - size:
+        starts.append(start)
+        start -= slide
+    return starts
+
+class WindowAggregator:
+    def __init__(self, name: str, size: timedelta, slide: Optional[timedelta] = None,
+                 allowed_lateness: timedelta = timedelta(0)):
+        self.name = name
+        self.size = size
+        self.slide = slide or size
+        self.allowed_lateness = allowed_lateness
+        self.windows: Dict[datetime, Dict[tuple, List]] = defaultdict(lambda: defaultdict(lambda: [0, 0, 0, 0.0]))
+        self.max_event_time: Optional[datetime] = None
+        self.watermark: Optional[datetime] = None
+        self.late = 0
+    
+    def add(self, timestamp: datetime, dimensions: Iterable[tuple], quantity: int, amount: float, completed: bool) -> bool:
+        starts = [
+            start for start in window_starts(timestamp, self.size, self.slide)
+            if self.watermark is None or start + self.size > self.watermark
+        ]
+        if not starts:
+            self.late += 1
+            return False
+        
+        if self.max_event_time is None or timestamp > self.max_event_time:
+            self.max_event_time = timestamp
+        
+        for start in starts:
+            window = self.windows[start]
+            for dimension in dimensions:
+                totals = window[dimension]
+                totals[0] += 1
+                totals[1] += int(completed)
+                totals[2] += quantity
+                totals[3] += amount
+        return True
+    
+    def advance(self, watermark: Optional[datetime] = None) -> List[Dict]:
+        if watermark is None:
+            if self.max_event_time is None:
+                return []
+            watermark = self.max_event_time - self.allowed_lateness
+        if self.watermark is None or watermark > self.watermark:
+            self.watermark = watermark
+        
+        results = []
+        for start in sorted(self.windows):
+            end = start + self.size
+            if end > self.watermark:
+                break
+            for (dimension, value), (count, completed, quantity, revenue) in self.windows.pop(start).items():
+                results.append({
+                    'window': self.name,
+                    'window_start': start.isoformat(),
+                    'window_end': end.isoformat(),
+                    'dimension': dimension,
+                    'dimension_value': value,
+                    'count': count,
+                    'completed': completed,
+                    'quantity': quantity,
+                    'revenue': round(revenue, 2),
+                    'conversion_rate': completed / count * 100 if count else 0.0,
+                })
+        return results
+
+class WindowedProcessor:
+    def __init__(
+        self,
+        windows: List[WindowAggregator],
+        categories: Optional[Dict[str, str]] = None,
+        consumer=None,
+        producer: Optional[SalesProducer] = None,
+        cache: Optional[CacheManager] = None,
+        idle_timeout: float = 5.0
+    ):
+        self.windows = windows
+        self.categories = categories or {}
+        self.consumer = consumer or KafkaConsumer(
+            settings.KAFKA_TOPIC_SALES,
+            bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS,
+            auto_offset_reset='latest',
+            group_id="sales-window-processor"
+        )
+        self.producer = producer or SalesProducer(topic=settings.KAFKA_TOPIC_PROCESSED, serializer='json')
+        self.cache = cache
+        self.idle_timeout = timedelta(seconds=idle_timeout)
+        self.last_event_at = datetime.utcnow()
+        self.processed = 0
+        self.emitted = 0
+    
+    def dimensions(self, event: Dict) -> List[tuple]:
+        dimensions = [('all', ''), ('payment_method', event.get('payment_method') or '')]
+        category = self.categories.get(event['product_id'])
+        if category is not None:
+            dimensions.append(('category', category))
+        return dimensions
+    
+    def process(self, event: Dict):
+        transaction = event_to_transaction(event)
+        dimensions = self.dimensions(transaction)
+        for window in self.windows:
+            window.add(
+                transaction['timestamp'],
+                dimensions,
+                transaction['quantity'],
+                transaction['total_amount'],
+                transaction['status'] == 'completed'
+            )
+        self.processed += 1
+        self.last_event_at = datetime.utcnow()
+    
+    def advance(self) -> List[Dict]:
+        watermark = None
+        now = datetime.utcnow()
+        if now - self.last_event_at >= self.idle_timeout:
+            watermark = now - self.idle_timeout
+        
+        results = []
+        for window in self.windows:
+            results.extend(window.advance(watermark))
+        if results:
+            self.emit(results)
+        return results
+    
+    def emit(self, results: List[Dict]):
+        self.producer.send_many(results)
+        if self.cache is not None:
+            self.cache.set_many(
+                {
+                    f"window:{result['window']}:{result['dimension']}:{result['dimension_value']}": result
+                    for result in results
+                },
+                ttl=settings.PROCESSOR_RESULT_TTL
+            )
+        self.emitted += len(results)
+    
+    def run(self, poll_timeout_ms: int = 500, max_records: int = 5000):
+        print(f"Starting window processor... {settings.KAFKA_TOPIC_SALES} -> {settings.KAFKA_TOPIC_PROCESSED}")
+        
+        try:
+            while True:
+                records = self.consumer.poll(timeout_ms=poll_timeout_ms, max_records=max_records)
+                for messages in records.values():
+                    for message in messages:
+                        self.process(decode_message(message))
+                
+                results = self.advance()
+                if results:
+                    late = sum(window.late for window in self.windows)
+                    print(f"Emitted {len(results)} window results "
+                          f"({self.processed:,} events processed, {late:,} late)")
+        
+        except KeyboardInterrupt:
+            print("\nShutting down window processor...")
+        finally:
+            self.consumer.close()
+            self.producer.close()
+
+def default_windows() -> List[WindowAggregator]:
+    lateness = timedelta(seconds=settings.PROCESSOR_ALLOWED_LATENESS)
+    return [
+        WindowAggregator(
+            'tumbling',
+            timedelta(seconds=settings.PROCESSOR_WINDOW_SECONDS),
+            allowed_lateness=lateness
+        ),
+        WindowAggregator(
+            'sliding',
+            timedelta(seconds=settings.PROCESSOR_SLIDING_WINDOW_SECONDS),
+            timedelta(seconds=settings.PROCESSOR_WINDOW_SECONDS),
+            allowed_lateness=lateness
+        ),
+    ]
+
+def load_categories() -> Dict[str, str]:
+    from config.resources import get_db_engine
+    from src.database.models import Product, get_session
+    
+    session = get_session(get_db_engine())
+    try:
+        return dict(session.query(Product.product_id, Product.category).all())
+    except Exception as e:
+        print(f"Could not load product categories: {e}")
+        return {}
+    finally:
+        session.close()
+
+def main():
+    parser = argparse.ArgumentParser(description='Aggregate sales events into windowed metrics')
+    parser.add_argument('--no-redis', action='store_true', help='Only publish results to Kafka')
+    args = parser.parse_args()
+    
+    cache = None if args.no_redis else CacheManager()
+    WindowedProcessor(default_windows(), load_categories(), cache=cache).run()
+
+if __name__ == "__main__":
+    main()
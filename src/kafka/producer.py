@@ -1,24 +1,45 @@
 from kafka import KafkaProducer
 import json
 import requests
+import threading
 import time
+from typing import Iterable, Iterator, Optional
 from config.settings import get_settings
+from src.kafka.serializers import encode_event, get_serializer
 
 settings = get_settings()
 
 class SalesProducer:
-    def __init__(self):
-        self.producer = KafkaProducer(
+    def __init__(
+        self,
+        linger_ms: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        compression_type: Optional[str] = None,
+        max_in_flight: Optional[int] = None,
+        serializer: Optional[str] = None,
+        topic: Optional[str] = None,
+        producer=None
+    ):
+        self.producer = producer or KafkaProducer(
             bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS,
-            value_serializer=lambda v: json.dumps(v).encode('utf-8'),
             acks='all',
-            retries=3
+            retries=3,
+            linger_ms=linger_ms if linger_ms is not None else settings.KAFKA_LINGER_MS,
+            batch_size=batch_size or settings.KAFKA_BATCH_SIZE,
+            compression_type=(compression_type or settings.KAFKA_COMPRESSION_TYPE) or None
         )
-        self.topic = settings.KAFKA_TOPIC_SALES
+        self.topic = topic or settings.KAFKA_TOPIC_SALES
+        self.serializer = get_serializer(serializer or settings.KAFKA_SERIALIZER)
+        self.max_in_flight = max_in_flight or settings.KAFKA_MAX_IN_FLIGHT
+        self._in_flight = threading.BoundedSemaphore(self.max_in_flight)
+        self._lock = threading.Lock()
+        self.delivered = 0
+        self.failed = 0
     
     def send_event(self, event: dict):
         try:
-            future = self.producer.send(self.topic, value=event)
+            value, headers = encode_event(event, self.serializer)
+            future = self.producer.send(self.topic, value=value, headers=headers)
             record_metadata = future.get(timeout=10)
             return {
                 'topic': record_metadata.topic,
@@ -29,30 +50,141 @@ class SalesProducer:
             print(f"Error sending event: {e}")
             return None
     
-    def stream_from_api(self, api_url: str = "http://localhost:8000/event", interval: float = 1.0):
+    def send_async(self, event: dict, timeout: Optional[float] = None) -> bool:
+        if not self._in_flight.acquire(timeout=timeout):
+            return False
+        
+        try:
+            value, headers = encode_event(event, self.serializer)
+            future = self.producer.send(self.topic, value=value, headers=headers)
+        except Exception as e:
+            self._in_flight.release()
+            print(f"Error sending event: {e}")
+            return False
+        
+        future.add_callback(self._on_delivery)
+        future.add_errback(self._on_error)
+        return True
+    
+    def send_many(self, events: Iterable[dict], timeout: Optional[float] = None) -> int:
+        queued = 0
+        for event in events:
+            if self.send_async(event, timeout=timeout):
+                queued += 1
+        return queued
+    
+    def _on_delivery(self, record_metadata):
+        with self._lock:
+            self.delivered += 1
+        self._in_flight.release()
+    
+    def _on_error(self, exc):
+        with self._lock:
+            self.failed += 1
+        self._in_flight.release()
+        print(f"Error delivering event: {exc}")
+    
+    def flush(self, timeout: Optional[float] = None):
+        self.producer.flush(timeout=timeout)
+    
+    def close(self, timeout: Optional[float] = None):
+        try:
+            self.flush(timeout=timeout)
+        finally:
+            self.producer.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *args):
+        self.close()
+    
+    def throughput(self, received: int, elapsed: float) -> dict:
+        elapsed = max(elapsed, 1e-9)
+        return {
+            'received': received,
+            'delivered': self.delivered,
+            'failed': self.failed,
+            'received_per_sec': received / elapsed,
+            'delivered_per_sec': self.delivered / elapsed,
+        }
+    
+    def stream_from_api(
+        self,
+        api_url: Optional[str] = None,
+        rate: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        session: Optional[requests.Session] = None,
+        max_events: Optional[int] = None,
+        report_interval: float = 5.0
+    ) -> dict:
+        api_url = api_url or settings.STREAM_API_URL
+        batch_size = batch_size or settings.STREAM_BATCH_SIZE
+        params = {
+            'rate': rate if rate is not None else settings.STREAM_RATE,
+            'batch': batch_size,
+            'format': 'ndjson',
+        }
+        session = session or requests.Session()
         print(f"Starting to stream events to Kafka topic: {self.topic}")
         
-        while True:
-            try:
-                response = requests.get(api_url)
-                if response.status_code == 200:
-                    event = response.json()
-                    result = self.send_event(event)
-                    if result:
-                        print(f"Sent: {event['transaction_id']} -> Partition {result['partition']}, Offset {result['offset']}")
-                time.sleep(interval)
-            except KeyboardInterrupt:
-                print("\nShutting down producer...")
-                break
-            except Exception as e:
-                print(f"Error: {e}")
-                time.sleep(5)
+        received = 0
+        attempts = 0
+        start = last_report = time.perf_counter()
+        try:
+            while max_events is None or received < max_events:
+                buffer = []
+                try:
+                    with session.get(api_url, params=params, stream=True, timeout=(5, 30)) as response:
+                        response.raise_for_status()
+                        for event in parse_stream(response.iter_lines(chunk_size=65536)):
+                            attempts = 0
+                            buffer.append(event)
+                            received += 1
+                            if len(buffer) >= batch_size or received == max_events:
+                                self.send_many(buffer)
+                                buffer = []
+                            
+                            now = time.perf_counter()
+                            if now - last_report >= report_interval:
+                                metrics = self.throughput(received, now - start)
+                                print(f"Received {metrics['received']:,} events - "
+                                      f"{metrics['received_per_sec']:,.0f} in/sec, "
+                                      f"{metrics['delivered_per_sec']:,.0f} delivered/sec")
+                                last_report = now
+                            if received == max_events:
+                                break
+                    if max_events is None or received < max_events:
+                        raise ConnectionError("stream ended")
+                except KeyboardInterrupt:
+                    print("\nShutting down producer...")
+                    break
+                except Exception as e:
+                    delay = min(settings.STREAM_RECONNECT_MAX_DELAY, 2 ** attempts)
+                    attempts += 1
+                    print(f"Stream error: {e}; reconnecting in {delay:.0f}s")
+                    time.sleep(delay)
+                finally:
+                    self.send_many(buffer)
+        finally:
+            session.close()
+            self.close()
         
-        self.producer.close()
+        return self.throughput(received, time.perf_counter() - start)
+
+def parse_stream(lines: Iterable) -> Iterator[dict]:
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        if line.startswith('data:'):
+            line = line[5:]
+        line = line.strip()
+        if line:
+            yield json.loads(line)
 
 def main():
     producer = SalesProducer()
-    producer.stream_from_api(interval=0.5)
+    producer.stream_from_api()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,200 @@
+import argparse
+import multiprocessing
+import queue
+import signal
+import time
+from typing import Callable, Dict, List, Optional
+from kafka import ConsumerRebalanceListener, KafkaConsumer
+from config.resources import get_db_engine, get_redis_client
+from config.settings import get_settings
+from src.cache.dedup import Deduplicator
+from src.cache.live_metrics import LiveMetrics
+from src.cache.redis_manager import get_cache
+from src.database.models import init_db, get_session
+from src.database.operations import DatabaseOperations
+from src.kafka.consumer import SalesConsumer
+from src.kafka.sink import TransactionSink
+
+settings = get_settings()
+
+def topic_partition_count(topic: str) -> Optional[int]:
+    consumer = KafkaConsumer(bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS)
+    try:
+        partitions = consumer.partitions_for_topic(topic)
+        return len(partitions) if partitions else None
+    finally:
+        consumer.close()
+
+def partition_lag(consumer) -> Dict:
+    assigned = list(consumer.assignment())
+    if not assigned:
+        return {}
+    end_offsets = consumer.end_offsets(assigned)
+    return {tp: max(0, end_offsets[tp] - consumer.position(tp)) for tp in assigned}
+
+class FlushOnRevoke(ConsumerRebalanceListener):
+    def __init__(self, worker_id: int, sink: TransactionSink):
+        self.worker_id = worker_id
+        self.sink = sink
+        self.consumer: Optional[SalesConsumer] = None
+    
+    def on_partitions_revoked(self, revoked):
+        if self.consumer is None or not revoked:
+            return
+        try:
+            self.consumer._flush_and_commit(self.sink)
+        except Exception as e:
+            dropped = self.sink.clear()
+            print(f"Worker {self.worker_id}: flush on revoke failed ({e}); {dropped} events left for the next owner")
+    
+    def on_partitions_assigned(self, assigned):
+        partitions = sorted(tp.partition for tp in assigned)
+        print(f"Worker {self.worker_id}: assigned partitions {partitions}")
+
+class WorkerReporter:
+    def __init__(self, worker_id: int, consumer: SalesConsumer, sink: TransactionSink, stats, interval: float):
+        self.worker_id = worker_id
+        self.consumer = consumer
+        self.sink = sink
+        self.stats = stats
+        self.interval = interval
+        self.last_report = time.monotonic()
+        self.last_written = 0
+    
+    def __call__(self, force: bool = False):
+        now = time.monotonic()
+        elapsed = now - self.last_report
+        if elapsed < self.interval and not force:
+            return
+        
+        try:
+            lag = sum(partition_lag(self.consumer.consumer).values())
+        except Exception:
+            lag = None
+        
+        self.stats.put({
+            'worker': self.worker_id,
+            'written': self.sink.written,
+            'events_per_sec': (self.sink.written - self.last_written) / max(elapsed, 1e-9),
+            'lag': lag,
+        })
+        self.last_report = now
+        self.last_written = self.sink.written
+
+def run_worker(worker_id: int, group_id: str, stop_event, stats, report_interval: float):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    
+    session = get_session(get_db_engine())
+    sink = TransactionSink(
+        DatabaseOperations(session, cache=get_cache(), live=LiveMetrics()),
+        dedup=Deduplicator(get_redis_client())
+    )
+    listener = FlushOnRevoke(worker_id, sink)
+    consumer = SalesConsumer(group_id=group_id, enable_auto_commit=False, listener=listener)
+    listener.consumer = consumer
+    
+    reporter = WorkerReporter(worker_id, consumer, sink, stats, report_interval)
+    try:
+        consumer.consume_to_sink(sink, stop_event=stop_event, reporter=reporter)
+    finally:
+        reporter(force=True)
+        session.close()
+        get_db_engine().dispose()
+
+class ConsumerRunner:
+    def __init__(
+        self,
+        workers: int,
+        group_id: str = "sales-analytics-group",
+        report_interval: float = 10.0,
+        target: Callable = run_worker,
+        start_method: Optional[str] = None
+    ):
+        self.workers = workers
+        self.group_id = group_id
+        self.report_interval = report_interval
+        self.target = target
+        self.context = multiprocessing.get_context(start_method)
+        self.stop_event = self.context.Event()
+        self.stats = self.context.Queue()
+        self.processes: List = []
+        self.latest: Dict[int, Dict] = {}
+    
+    def start(self):
+        for worker_id in range(self.workers):
+            process = self.context.Process(
+                target=self.target,
+                args=(worker_id, self.group_id, self.stop_event, self.stats, self.report_interval),
+                name=f"sales-consumer-{worker_id}"
+            )
+            process.start()
+            self.processes.append(process)
+        print(f"Started {self.workers} consumer workers in group {self.group_id}")
+    
+    def stop(self, *args):
+        self.stop_event.set()
+    
+    def drain(self, timeout: float = 0.0):
+        while True:
+            try:
+                report = self.stats.get(timeout=timeout)
+            except queue.Empty:
+                return
+            self.latest[report['worker']] = report
+            lag = 'n/a' if report['lag'] is None else f"{report['lag']:,}"
+            print(f"Worker {report['worker']}: {report['events_per_sec']:,.0f} events/sec, "
+                  f"{report['written']:,} written, lag {lag}")
+            timeout = 0.0
+    
+    def join(self, timeout: float = 30.0):
+        deadline = time.monotonic() + timeout
+        for process in self.processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                print(f"{process.name} did not stop in time; terminating")
+                process.terminate()
+                process.join()
+        self.drain()
+    
+    def run(self):
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+        self.start()
+        
+        try:
+            while not self.stop_event.is_set():
+                self.drain(timeout=1.0)
+                if not any(process.is_alive() for process in self.processes):
+                    print("All consumer workers exited")
+                    break
+        finally:
+            print("\nShutting down consumer workers...")
+            self.stop_event.set()
+            self.join()
+        
+        total = sum(report['written'] for report in self.latest.values())
+        print(f"Consumer workers stopped; {total:,} events written")
+
+def main():
+    parser = argparse.ArgumentParser(description='Run parallel Kafka consumer workers')
+    parser.add_argument('--workers', type=int, default=settings.CONSUMER_WORKERS)
+    parser.add_argument('--group-id', default="sales-analytics-group")
+    parser.add_argument('--report-interval', type=float, default=10.0)
+    args = parser.parse_args()
+    
+    init_db(settings.database_url).dispose()
+    
+    workers = args.workers
+    try:
+        partitions = topic_partition_count(settings.KAFKA_TOPIC_SALES)
+    except Exception as e:
+        print(f"Could not read partition count: {e}")
+        partitions = None
+    if partitions and workers > partitions:
+        print(f"{settings.KAFKA_TOPIC_SALES} has {partitions} partitions; limiting to {partitions} workers")
+        workers = partitions
+    
+    ConsumerRunner(workers, args.group_id, args.report_interval).run()
+
+if __name__ == "__main__":
+    main()
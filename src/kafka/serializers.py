@@ -0,0 +1,134 @@
+import struct
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+import orjson
+from src.api.schemas import SalesEvent
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+CONTENT_TYPE_HEADER = 'content-type'
+EPOCH = datetime(1970, 1, 1)
+NULL_LENGTH = 0xFFFF
+MICROSECOND = timedelta(microseconds=1)
+NUMERIC_CODES = {datetime: 'q', int: 'q', float: 'd'}
+
+def to_datetime(value) -> datetime:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+class JsonSerializer:
+    name = 'json'
+    content_type = b'application/json'
+    
+    def dumps(self, event: Dict) -> bytes:
+        return orjson.dumps(event)
+    
+    def loads(self, data: bytes) -> Dict:
+        return orjson.loads(data)
+
+class MsgpackSerializer:
+    name = 'msgpack'
+    content_type = b'application/msgpack'
+    
+    def __init__(self):
+        if msgpack is None:
+            raise ImportError("msgpack is not installed; pip install msgpack to use the msgpack serializer")
+    
+    def dumps(self, event: Dict) -> bytes:
+        return msgpack.packb(event, default=str)
+    
+    def loads(self, data: bytes) -> Dict:
+        return msgpack.unpackb(data)
+
+class StructSerializer:
+    name = 'struct'
+    content_type = b'application/x-sales-event'
+    
+    def __init__(self, model=SalesEvent):
+        self.numeric: List[Tuple[str, type]] = []
+        self.strings: List[str] = []
+        for field, info in model.model_fields.items():
+            if info.annotation in NUMERIC_CODES:
+                self.numeric.append((field, info.annotation))
+            else:
+                self.strings.append(field)
+        self.fields = list(model.model_fields)
+        self.header = struct.Struct(
+            '<' + ''.join(NUMERIC_CODES[kind] for _, kind in self.numeric) + 'H' * len(self.strings)
+        )
+        self.timestamps = [index for index, (_, kind) in enumerate(self.numeric) if kind is datetime]
+        self.string_start = len(self.numeric)
+        positions = {field: (index, kind) for index, (field, kind) in enumerate(self.numeric)}
+        self.plan = [(field, *positions.get(field, (None, str))) for field in self.fields]
+    
+    def dumps(self, event: Dict) -> bytes:
+        values = [event[field] for field, _ in self.numeric]
+        for index in self.timestamps:
+            values[index] = (to_datetime(values[index]) - EPOCH) // MICROSECOND
+        
+        encoded = []
+        for field in self.strings:
+            value = event.get(field)
+            if value is None:
+                values.append(NULL_LENGTH)
+                continue
+            value = value.encode('utf-8')
+            if len(value) >= NULL_LENGTH:
+                raise ValueError(f"{field} is {len(value)} bytes; struct strings must be shorter than {NULL_LENGTH}")
+            values.append(len(value))
+            encoded.append(value)
+        return self.header.pack(*values) + b''.join(encoded)
+    
+    def loads(self, data: bytes) -> Dict:
+        values = self.header.unpack_from(data)
+        strings = {}
+        offset = self.header.size
+        for field, size in zip(self.strings, values[self.string_start:]):
+            if size == NULL_LENGTH:
+                strings[field] = None
+                continue
+            strings[field] = data[offset:offset + size].decode('utf-8')
+            offset += size
+        
+        event = {}
+        for field, index, kind in self.plan:
+            if index is None:
+                event[field] = strings[field]
+            elif kind is datetime:
+                event[field] = (EPOCH + timedelta(microseconds=values[index])).isoformat()
+            else:
+                event[field] = values[index]
+        return event
+
+SERIALIZERS = {
+    'json': JsonSerializer,
+    'msgpack': MsgpackSerializer,
+    'struct': StructSerializer,
+}
+_instances: Dict[str, object] = {}
+
+def get_serializer(name: str):
+    if name not in SERIALIZERS:
+        raise ValueError(f"Unknown serializer {name!r}; expected one of {sorted(SERIALIZERS)}")
+    if name not in _instances:
+        _instances[name] = SERIALIZERS[name]()
+    return _instances[name]
+
+def serializer_for_headers(headers: Optional[List[Tuple[str, bytes]]]):
+    for key, value in headers or []:
+        if key == CONTENT_TYPE_HEADER:
+            for name, serializer in SERIALIZERS.items():
+                if serializer.content_type == value:
+                    return get_serializer(name)
+            raise ValueError(f"Unsupported content type {value!r}")
+    return get_serializer('json')
+
+def encode_event(event: Dict, serializer) -> Tuple[bytes, List[Tuple[str, bytes]]]:
+    return serializer.dumps(event), [(CONTENT_TYPE_HEADER, serializer.content_type)]
+
+def decode_message(message) -> Dict:
+    return serializer_for_headers(getattr(message, 'headers', None)).loads(message.value)
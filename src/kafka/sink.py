@@ -0,0 +1,72 @@
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+from src.cache.dedup import Deduplicator
+from src.database.models import Transaction
+from src.database.operations import DatabaseOperations
+from config.settings import get_settings
+
+settings = get_settings()
+
+TRANSACTION_FIELDS = [column.name for column in Transaction.__table__.columns]
+
+def event_to_transaction(event: Dict) -> Dict:
+    transaction = {field: event.get(field) for field in TRANSACTION_FIELDS}
+    if isinstance(transaction['timestamp'], str):
+        transaction['timestamp'] = datetime.fromisoformat(transaction['timestamp'])
+    return transaction
+
+class TransactionSink:
+    def __init__(
+        self,
+        ops: DatabaseOperations,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        dedup: Optional[Deduplicator] = None
+    ):
+        self.ops = ops
+        self.batch_size = batch_size or settings.CONSUMER_BATCH_SIZE
+        self.flush_interval = flush_interval if flush_interval is not None else settings.CONSUMER_FLUSH_INTERVAL
+        self.buffer: List[Dict] = []
+        self.batch_started: Optional[float] = None
+        self.dedup = dedup
+        self.written = 0
+        self.duplicates = 0
+    
+    def add(self, event: Dict):
+        if not self.buffer:
+            self.batch_started = time.monotonic()
+        self.buffer.append(event_to_transaction(event))
+    
+    def should_flush(self) -> bool:
+        if not self.buffer:
+            return False
+        if len(self.buffer) >= self.batch_size:
+            return True
+        return time.monotonic() - self.batch_started >= self.flush_interval
+    
+    def clear(self) -> int:
+        count = len(self.buffer)
+        self.buffer = []
+        self.batch_started = None
+        return count
+    
+    def flush(self) -> int:
+        if not self.buffer:
+            return 0
+        
+        batch = self.dedup.filter(self.buffer) if self.dedup else self.buffer
+        try:
+            inserted = self.ops.bulk_insert_transactions(batch)
+        except Exception:
+            self.ops.session.rollback()
+            raise
+        
+        if self.dedup:
+            self.dedup.mark(txn['transaction_id'] for txn in batch)
+        count = len(self.buffer)
+        self.written += len(inserted)
+        self.duplicates += count - len(inserted)
+        self.buffer = []
+        self.batch_started = None
+        return count
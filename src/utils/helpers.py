@@ -97,3 +97,26 @@ class Timer:
     def __exit__(self, *args):
         elapsed = time.time() - self.start_time
         print(f"{self.name} took {elapsed:.2f} seconds")
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float = None, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.clock = clock
+        self.tokens = self.capacity
+        self.updated = clock()
+    
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def take(self, amount: float = 1) -> float:
+        if self.rate <= 0:
+            return 0.0
+        
+        self._refill()
+        self.tokens -= amount
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
@@ -0,0 +1,133 @@
+import orjson
+from collections import Counter
+import pytest
+from datetime import datetime
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from src.api.main import SalesSimulator, app, get_analytics
+from src.database.async_operations import AsyncDatabaseOperations
+from src.database.models import Base, Product
+from src.database.operations import DatabaseOperations
+from src.utils.helpers import TokenBucket
+
+@pytest.fixture
+def client(tmp_path):
+    database_path = tmp_path / 'api.db'
+    engine = create_engine(f'sqlite:///{database_path}')
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(Product(product_id='PRD001', name='Laptop', category='Electronics', price=100.0, cost=50.0))
+    session.commit()
+    DatabaseOperations(session).bulk_insert_transactions([
+        {
+            'transaction_id': f'TXN{i:03d}',
+            'timestamp': datetime.utcnow(),
+            'customer_id': 'CUST001',
+            'product_id': 'PRD001',
+            'quantity': 1,
+            'unit_price': 100.0,
+            'total_amount': 100.0,
+            'payment_method': 'credit_card',
+            'status': 'completed' if i < 3 else 'failed'
+        }
+        for i in range(4)
+    ])
+    session.close()
+    
+    async_engine = create_async_engine(f'sqlite+aiosqlite:///{database_path}')
+    factory = async_sessionmaker(async_engine, expire_on_commit=False)
+    
+    async def override():
+        async with factory() as async_session:
+            yield AsyncDatabaseOperations(async_session)
+    
+    app.dependency_overrides[get_analytics] = override
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+def test_top_products_endpoint(client):
+    response = client.get('/analytics/top-products', params={'limit': 5})
+    
+    assert response.status_code == 200
+    assert response.json() == [
+        {'name': 'Laptop', 'category': 'Electronics', 'sales_count': 4, 'revenue': 400.0}
+    ]
+
+def test_categories_and_revenue_endpoints(client):
+    categories = client.get('/analytics/categories').json()
+    revenue = client.get('/analytics/revenue', params={'period': 'hour', 'hours': 2}).json()
+    
+    assert categories == [{'category': 'Electronics', 'count': 3, 'revenue': 300.0}]
+    assert sum(row['count'] for row in revenue) == 4
+    assert client.get('/analytics/revenue', params={'period': 'week'}).status_code == 400
+
+def test_customer_lifetime_value_endpoint(client):
+    response = client.get('/analytics/customers/CUST001/ltv')
+    
+    assert response.json() == {'customer_id': 'CUST001', 'lifetime_value': 300.0}
+
+@pytest.fixture
+def catalog(monkeypatch):
+    monkeypatch.setattr('src.api.main.simulator', SalesSimulator(
+        products=[{'product_id': 'PRD001', 'price': 10.0}],
+        customers=[{'customer_id': 'CUST001'}]
+    ))
+
+def test_token_bucket_waits_for_refill():
+    now = [0.0]
+    bucket = TokenBucket(rate=100, capacity=100, clock=lambda: now[0])
+    
+    assert bucket.take(100) == 0.0
+    assert bucket.take(50) == pytest.approx(0.5)
+    now[0] = 1.5
+    assert bucket.take(100) == 0.0
+
+def test_stream_emits_batched_ndjson_frames(catalog):
+    client = TestClient(app)
+    response = client.get('/stream', params={'rate': 0, 'batch': 250, 'format': 'ndjson', 'limit': 1000})
+    
+    events = [orjson.loads(line) for line in response.content.splitlines()]
+    assert response.headers['content-type'].startswith('application/x-ndjson')
+    assert len(events) == 1000
+    assert len({event['transaction_id'] for event in events}) == 1000
+    assert all(event['product_id'] == 'PRD001' for event in events)
+
+def test_stream_rejects_unknown_format(catalog):
+    client = TestClient(app)
+    
+    assert client.get('/stream', params={'format': 'xml'}).status_code == 400
+    assert len(client.get('/events', params={'count': 5}).json()) == 5
+
+def test_generate_batch_draws_weighted_columns():
+    simulator = SalesSimulator(
+        products=[{'product_id': f'PRD{i:03d}', 'price': 10.0 + i} for i in range(50)],
+        customers=[{'customer_id': f'CUST{i:03d}'} for i in range(50)],
+        status_weights={'completed': 1.0},
+        skew=1.5,
+        seed=7
+    )
+    
+    events = simulator.generate_batch(5000)
+    
+    assert [event['transaction_id'] for event in events[:2]] == ['TXN00000001', 'TXN00000002']
+    assert simulator.generate_event()['transaction_id'] == 'TXN00005001'
+    assert {event['status'] for event in events} == {'completed'}
+    assert all(event['total_amount'] == round(event['unit_price'] * event['quantity'], 2) for event in events)
+    counts = Counter(event['product_id'] for event in events)
+    assert counts.most_common(1)[0][1] > 5000 / 50 * 5
+
+def test_simulator_falls_back_to_synthetic_catalog(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    simulator = SalesSimulator(seed=1)
+    
+    assert len(simulator.product_ids) == 100
+    assert 'Warning' in capsys.readouterr().out
+    assert simulator.generate_event()['customer_id'].startswith('CUST')
+
+def test_health_reports_created_pools(client):
+    body = client.get('/health').json()
+    
+    assert body['status'] == 'healthy'
+    assert set(body['pools']) <= {'database', 'database_async', 'redis'}
@@ -0,0 +1,401 @@
+import fnmatch
+import json
+import threading
+import time
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.cache.dedup import Deduplicator, RecentIds
+from src.cache.query_cache import cached_query, decode_result, encode_result
+from src.cache.live_metrics import LiveMetrics
+from src.cache.local_cache import LocalCache, MISSING
+from src.cache.redis_manager import CacheManager
+from src.database.models import Base, Product
+from src.database.operations import DatabaseOperations
+
+class DictCache:
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+        self.indexes = {}
+    
+    def get(self, key):
+        return self.data.get(key)
+    
+    def set(self, key, value, ttl=None):
+        self.data[key] = value
+        self.ttls[key] = ttl
+        return True
+    
+    def add_to_index(self, index, key):
+        self.indexes.setdefault(index, set()).add(key)
+    
+    def delete_index(self, index):
+        for key in self.indexes.pop(index, set()):
+            self.data.pop(key, None)
+        return True
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.calls = []
+        self.subscribers = {}
+    
+    def get(self, key):
+        self.calls.append('get')
+        return self.data.get(key)
+    
+    def setex(self, key, ttl, value):
+        self.calls.append('setex')
+        self.data[key] = value
+    
+    def set(self, key, value, ex=None):
+        self.calls.append('set')
+        self.data[key] = value
+    
+    def hincrby(self, key, field, amount):
+        fields = self.data.setdefault(key, {})
+        fields[field] = int(fields.get(field, 0)) + amount
+    
+    def hincrbyfloat(self, key, field, amount):
+        fields = self.data.setdefault(key, {})
+        fields[field] = float(fields.get(field, 0)) + amount
+    
+    def hgetall(self, key):
+        return {field: str(value) for field, value in self.data.get(key, {}).items()}
+    
+    def expireat(self, key, when):
+        self.calls.append('expireat')
+    
+    def exists(self, key):
+        return int(key in self.data)
+    
+    def sadd(self, key, *members):
+        self.data.setdefault(key, set()).update(members)
+    
+    def smembers(self, key):
+        return set(self.data.get(key, set()))
+    
+    def delete(self, *keys):
+        self.calls.append('delete')
+        for key in keys:
+            self.data.pop(key, None)
+    
+    def mget(self, keys):
+        self.calls.append('mget')
+        return [self.data.get(key) for key in keys]
+    
+    def keys(self, pattern):
+        raise AssertionError('KEYS blocks the server')
+    
+    def scan_iter(self, match='*', count=None):
+        self.calls.append('scan')
+        return iter([key for key in self.data if fnmatch.fnmatch(key, match)])
+    
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+    
+    def pubsub(self, ignore_subscribe_messages=False):
+        return FakePubSub(self)
+    
+    def publish(self, channel, message):
+        for handler in self.subscribers.get(channel, []):
+            handler({'channel': channel, 'data': message})
+
+class FakePubSub:
+    def __init__(self, client):
+        self.client = client
+    
+    def subscribe(self, **handlers):
+        for channel, handler in handlers.items():
+            self.client.subscribers.setdefault(channel, []).append(handler)
+    
+    def run_in_thread(self, sleep_time=0, daemon=False):
+        return self
+    
+    def stop(self):
+        pass
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+    
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return queue
+    
+    def execute(self):
+        self.client.calls.append('pipeline')
+        return [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+
+class SlowQueries:
+    def __init__(self, cache):
+        self.cache = cache
+        self.calls = 0
+    
+    @cached_query(ttl=30)
+    def total(self, hours: int = 24):
+        self.calls += 1
+        time.sleep(0.05)
+        return 42.0
+
+def test_cached_query_normalizes_arguments():
+    queries = SlowQueries(DictCache())
+    
+    assert queries.total() == 42.0
+    assert queries.total(24) == 42.0
+    assert queries.total(hours=24) == 42.0
+    assert queries.total(hours=1) == 42.0
+    assert queries.calls == 2
+    assert set(queries.cache.ttls.values()) == {30}
+
+def test_cached_query_single_flight():
+    queries = SlowQueries(DictCache())
+    threads = [threading.Thread(target=queries.total) for _ in range(8)]
+    
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert queries.calls == 1
+
+def test_cached_query_without_cache_calls_through():
+    queries = SlowQueries(None)
+    queries.total()
+    queries.total()
+    
+    assert queries.calls == 2
+
+def test_encode_decode_rows_round_trip():
+    engine = create_engine('sqlite:///:memory:')
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql("SELECT 'Books' AS category, 3 AS count, 1.5 AS revenue").all()
+    
+    [row] = decode_result(encode_result(rows))
+    
+    assert row.category == 'Books'
+    assert row.count == 3
+    assert tuple(row) == tuple(rows[0])
+    assert decode_result(encode_result(datetime(2024, 1, 1))) == datetime(2024, 1, 1)
+
+def test_database_operations_read_through_cache():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    cache = DictCache()
+    ops = DatabaseOperations(session, cache=cache)
+    
+    assert ops.calculate_conversion_rate() == 0.0
+    assert len(cache.data) == 1
+    
+    ops.session = None
+    assert ops.calculate_conversion_rate() == 0.0
+
+def test_ingest_invalidates_cached_queries():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    ops = DatabaseOperations(session, cache=CacheManager(client=FakeRedis(), local_cache_size=0))
+    
+    assert ops.get_kpis()['total'] == 0
+    ops.bulk_insert_transactions([{
+        'transaction_id': 'TXN001', 'timestamp': datetime.utcnow(), 'customer_id': 'CUST001',
+        'product_id': 'PRD001', 'quantity': 1, 'unit_price': 10.0, 'total_amount': 10.0,
+        'payment_method': 'paypal', 'status': 'completed'
+    }])
+    
+    assert ops.get_kpis()['total'] == 1
+    assert ops.bulk_insert_transactions([]) == []
+    assert ops.get_kpis()['total'] == 1
+
+def test_cache_keys_separate_rollup_and_raw_reads():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    cache = DictCache()
+    
+    DatabaseOperations(session, cache=cache).get_kpis()
+    DatabaseOperations(session, use_rollups=False, cache=cache).get_kpis()
+    
+    assert len(cache.data) == 2
+
+def test_ingest_invalidation_is_coalesced():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    cache = DictCache()
+    ops = DatabaseOperations(session, cache=cache)
+    transaction = {
+        'timestamp': datetime.utcnow(), 'customer_id': 'CUST001', 'product_id': 'PRD001',
+        'quantity': 1, 'unit_price': 10.0, 'total_amount': 10.0,
+        'payment_method': 'paypal', 'status': 'completed'
+    }
+    
+    ops.get_kpis()
+    ops.bulk_insert_transactions([dict(transaction, transaction_id='TXN001')])
+    assert ops.get_kpis()['total'] == 1
+    ops.bulk_insert_transactions([dict(transaction, transaction_id='TXN002')])
+    assert ops.get_kpis()['total'] == 1
+    
+    ops.invalidated_at -= 3600
+    ops.bulk_insert_transactions([dict(transaction, transaction_id='TXN003')])
+    assert ops.get_kpis()['total'] == 3
+
+def test_cache_manager_index_invalidates_local_tier():
+    client = FakeRedis()
+    writer = CacheManager(client=client)
+    reader = CacheManager(client=client)
+    writer.set('query:a', 1)
+    writer.add_to_index('query:index', 'query:a')
+    assert reader.get('query:a') == 1
+    
+    writer.delete_index('query:index')
+    
+    assert reader.get('query:a') is None
+    assert client.smembers('query:index') == set()
+
+def test_set_many_and_get_many_use_one_round_trip():
+    client = FakeRedis()
+    cache = CacheManager(client=client)
+    
+    cache.set_many({'a': 1, 'b': {'x': 2}})
+    values = cache.get_many(['a', 'b', 'missing'])
+    
+    assert values == {'a': 1, 'b': {'x': 2}}
+    assert client.calls.count('pipeline') == 1
+    assert client.calls.count('mget') == 1
+    assert 'get' not in client.calls
+
+def test_get_metrics_scans_and_batches():
+    client = FakeRedis()
+    cache = CacheManager(client=client)
+    for i in range(5):
+        client.data[f'metric:{i}'] = json.dumps(i)
+    client.data['other'] = json.dumps('ignored')
+    
+    metrics = cache.get_metrics(batch_size=2)
+    
+    assert metrics == {f'metric:{i}': i for i in range(5)}
+    assert client.calls.count('mget') == 3
+    assert 'get' not in client.calls
+
+def test_local_cache_evicts_least_recently_used_and_expired():
+    local = LocalCache(maxsize=2, ttl=60)
+    local.set('a', 1)
+    local.set('b', 2)
+    local.get('a')
+    local.set('c', 3)
+    
+    assert local.get('a') == 1
+    assert local.get('b') is MISSING
+    
+    local.set('short', 4, ttl=0.01)
+    time.sleep(0.02)
+    assert local.get('short') is MISSING
+
+def test_two_tier_cache_serves_hot_keys_locally():
+    client = FakeRedis()
+    cache = CacheManager(client=client, local_cache_size=10)
+    client.data['hot'] = json.dumps({'value': 1})
+    
+    assert cache.get('hot') == {'value': 1}
+    assert cache.get('hot') == {'value': 1}
+    assert cache.get('cold') is None
+    
+    stats = cache.get_stats()
+    assert client.calls.count('get') == 2
+    assert (stats['l1_hits'], stats['l1_misses']) == (1, 2)
+    assert (stats['l2_hits'], stats['l2_misses']) == (1, 1)
+
+def test_writes_invalidate_other_processes_local_tier():
+    client = FakeRedis()
+    writer = CacheManager(client=client, local_cache_size=10)
+    reader = CacheManager(client=client, local_cache_size=10)
+    
+    writer.set('key', 'old')
+    assert reader.get('key') == 'old'
+    
+    writer.set('key', 'new')
+    assert writer.get('key') == 'new'
+    assert reader.get('key') == 'new'
+
+def test_recent_ids_evicts_oldest_fingerprints():
+    recent = RecentIds(maxsize=2)
+    recent.add('TXN1')
+    recent.add('TXN2')
+    recent.add('TXN2')
+    assert 'TXN1' in recent
+    recent.add('TXN3')
+    
+    assert 'TXN1' not in recent
+    assert 'TXN2' in recent and 'TXN3' in recent
+    assert len(recent) == 2
+
+def test_recent_ids_matches_a_sliding_window_under_churn():
+    recent = RecentIds(maxsize=50)
+    ids = [f'TXN{i}' for i in range(2000)]
+    for i, transaction_id in enumerate(ids):
+        recent.add(transaction_id)
+        if i % 97 == 0:
+            assert all(previous in recent for previous in ids[max(0, i - 49):i + 1])
+            assert not any(previous in recent for previous in ids[max(0, i - 200):max(0, i - 49)])
+    
+    assert len(recent) == 50
+    assert recent.nbytes == 8 * (128 + 50)
+
+def test_deduplicator_drops_batch_local_and_redis_duplicates():
+    redis_client = FakeRedis()
+    first = Deduplicator(client=redis_client, maxsize=100)
+    second = Deduplicator(client=redis_client, maxsize=100)
+    batch = [{'transaction_id': f'TXN{i}'} for i in (1, 2, 2, 3)]
+    
+    fresh = first.filter(batch)
+    first.mark(txn['transaction_id'] for txn in fresh)
+    
+    assert [txn['transaction_id'] for txn in fresh] == ['TXN1', 'TXN2', 'TXN3']
+    assert first.filter([{'transaction_id': 'TXN1'}]) == []
+    assert second.filter([{'transaction_id': 'TXN3'}, {'transaction_id': 'TXN4'}]) == [{'transaction_id': 'TXN4'}]
+    assert first.stats == {'batch': 1, 'local': 1, 'redis': 0}
+    assert second.stats['redis'] == 1
+
+def test_ingest_updates_live_metrics(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path / "live.db"}')
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(Product(product_id='PRD001', name='Laptop', category='Electronics', price=50.0, cost=20.0))
+    session.commit()
+    redis_client = FakeRedis()
+    live = LiveMetrics(client=redis_client)
+    ops = DatabaseOperations(session, live=live)
+    now = datetime.utcnow()
+    transactions = [
+        {
+            'transaction_id': f'TXN{i}',
+            'timestamp': now,
+            'customer_id': 'CUST001',
+            'product_id': 'PRD001',
+            'quantity': 1,
+            'unit_price': 50.0,
+            'total_amount': 50.0,
+            'payment_method': 'paypal' if i % 2 else 'crypto',
+            'status': 'failed' if i == 0 else 'completed'
+        }
+        for i in range(4)
+    ]
+    
+    ops.bulk_insert_transactions(transactions)
+    ops.bulk_insert_transactions(transactions)
+    snapshot = live.snapshot(hours=2, now=now)
+    
+    assert snapshot['revenue'] == 150.0
+    assert (snapshot['total'], snapshot['completed'], snapshot['failed']) == (4, 3, 1)
+    assert snapshot['avg_ticket'] == 50.0
+    assert snapshot['conversion_rate'] == 75.0
+    assert snapshot['payment_methods'] == {'crypto': 2, 'paypal': 2}
+    assert snapshot['categories'] == {'Electronics': {'revenue': 150.0, 'sales_count': 3}}
+    assert [row['transaction_count'] for row in snapshot['hourly']] == [0, 3]
+    session.close()
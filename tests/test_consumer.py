@@ -0,0 +1,149 @@
+import pytest
+from collections import namedtuple
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.database.models import Base, Transaction
+from src.database.operations import DatabaseOperations
+from kafka.structs import TopicPartition
+from src.cache.dedup import Deduplicator
+from src.kafka.consumer import SalesConsumer
+from src.kafka.serializers import encode_event, get_serializer
+from src.kafka.runner import ConsumerRunner, FlushOnRevoke, partition_lag
+from src.kafka.sink import TransactionSink
+
+Message = namedtuple('Message', ['value', 'headers'])
+
+class FakeKafkaConsumer:
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.commits = 0
+        self.closed = False
+
+    def poll(self, timeout_ms=0, max_records=None):
+        if not self.batches:
+            raise KeyboardInterrupt
+        return {('sales-events', 0): [Message(*encode_event(event, get_serializer('json'))) for event in self.batches.pop(0)]}
+
+    def commit(self):
+        self.commits += 1
+
+    def close(self, autocommit=True):
+        self.closed = True
+
+@pytest.fixture
+def db_session():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    yield session
+    session.close()
+
+def make_events(start, count):
+    return [
+        {
+            'transaction_id': f'TXN{i:03d}',
+            'timestamp': '2024-01-01T12:00:00',
+            'customer_id': 'CUST001',
+            'product_id': 'PRD001',
+            'quantity': 1,
+            'unit_price': 10.0,
+            'total_amount': 10.0,
+            'payment_method': 'credit_card',
+            'status': 'completed'
+        }
+        for i in range(start, start + count)
+    ]
+
+def test_consume_to_sink_commits_after_each_batch(db_session):
+    fake = FakeKafkaConsumer([make_events(0, 3), make_events(3, 3), make_events(6, 1)])
+    sink = TransactionSink(DatabaseOperations(db_session), batch_size=3, flush_interval=60)
+
+    SalesConsumer(consumer=fake).consume_to_sink(sink)
+
+    assert db_session.query(Transaction).count() == 7
+    assert fake.commits == 3
+    assert fake.closed
+
+def test_failed_flush_does_not_commit_offsets(db_session):
+    invalid = [dict(event, customer_id=None) for event in make_events(2, 2)]
+    fake = FakeKafkaConsumer([make_events(0, 2), invalid])
+    sink = TransactionSink(DatabaseOperations(db_session), batch_size=2, flush_interval=60)
+
+    with pytest.raises(Exception):
+        SalesConsumer(consumer=fake).consume_to_sink(sink)
+
+    assert db_session.query(Transaction).count() == 2
+    assert fake.commits == 1
+
+class StopAfter:
+    def __init__(self, polls):
+        self.polls = polls
+
+    def is_set(self):
+        self.polls -= 1
+        return self.polls < 0
+
+def test_consume_to_sink_flushes_on_stop(db_session):
+    fake = FakeKafkaConsumer([make_events(0, 2), make_events(2, 1)])
+    sink = TransactionSink(DatabaseOperations(db_session), batch_size=10, flush_interval=60)
+
+    SalesConsumer(consumer=fake).consume_to_sink(sink, stop_event=StopAfter(2))
+
+    assert db_session.query(Transaction).count() == 3
+    assert fake.commits == 1
+    assert fake.closed
+
+def test_revoke_flushes_and_commits_owned_events(db_session):
+    fake = FakeKafkaConsumer([])
+    sink = TransactionSink(DatabaseOperations(db_session), batch_size=10, flush_interval=60)
+    listener = FlushOnRevoke(0, sink)
+    listener.consumer = SalesConsumer(consumer=fake)
+    for event in make_events(0, 2):
+        sink.add(event)
+
+    listener.on_partitions_revoked([TopicPartition('sales-events', 0)])
+
+    assert db_session.query(Transaction).count() == 2
+    assert fake.commits == 1
+
+def test_partition_lag_uses_end_offsets():
+    class LagConsumer:
+        def assignment(self):
+            return {TopicPartition('sales-events', 0), TopicPartition('sales-events', 1)}
+
+        def end_offsets(self, partitions):
+            return {tp: 100 for tp in partitions}
+
+        def position(self, tp):
+            return 40 if tp.partition == 0 else 100
+
+    assert sum(partition_lag(LagConsumer()).values()) == 60
+
+def report_and_wait(worker_id, group_id, stop_event, stats, report_interval):
+    stats.put({'worker': worker_id, 'written': worker_id + 1, 'events_per_sec': 1.0, 'lag': 0})
+    stop_event.wait(10)
+
+def test_runner_starts_and_stops_workers():
+    runner = ConsumerRunner(2, target=report_and_wait, start_method='fork')
+    runner.start()
+    while len(runner.latest) < 2:
+        runner.drain(timeout=5)
+    runner.stop()
+    runner.join(timeout=10)
+
+    assert sorted(runner.latest) == [0, 1]
+    assert all(process.exitcode == 0 for process in runner.processes)
+
+def test_replayed_messages_are_dropped_before_the_database(db_session):
+    fake = FakeKafkaConsumer([make_events(0, 3), make_events(0, 3) + make_events(3, 1)])
+    sink = TransactionSink(DatabaseOperations(db_session), batch_size=3, flush_interval=60,
+                           dedup=Deduplicator(maxsize=100))
+
+    SalesConsumer(consumer=fake).consume_to_sink(sink)
+
+    assert db_session.query(Transaction).count() == 4
+    assert sink.written == 4
+    assert sink.duplicates == 3
+    assert sink.dedup.stats['local'] == 3
+    assert fake.commits == 2
@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.dashboard.data import RECENT_COLUMNS, category_performance, payment_methods, recent_transactions, sales_by_hour
+from src.database.models import Base, Product
+from src.database.operations import DatabaseOperations
+
+def seeded_engine(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path / "dashboard.db"}')
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(Product(product_id='PRD001', name='Laptop', category='Electronics', price=25.0, cost=10.0))
+    session.commit()
+    now = datetime.utcnow()
+    DatabaseOperations(session).bulk_insert_transactions([
+        {
+            'transaction_id': f'TXN{i:03d}',
+            'timestamp': now - timedelta(hours=i % 3),
+            'customer_id': 'CUST001',
+            'product_id': 'PRD001',
+            'quantity': 1,
+            'unit_price': 25.0,
+            'total_amount': 25.0,
+            'payment_method': 'paypal',
+            'status': 'failed' if i == 0 else 'completed'
+        }
+        for i in range(9)
+    ])
+    session.close()
+    return engine
+
+def test_recent_transactions_selects_columns_with_bound_limit(tmp_path):
+    engine = seeded_engine(tmp_path)
+
+    df = recent_transactions(engine, limit=5)
+
+    assert list(df.columns) == RECENT_COLUMNS
+    assert len(df) == 5
+    assert set(df['status']) == {'completed'}
+
+def test_hourly_and_category_panels_read_rollups(tmp_path):
+    engine = seeded_engine(tmp_path)
+
+    hourly = sales_by_hour(engine, hours=2)
+    categories = category_performance(engine)
+
+    assert len(hourly) == 2
+    assert list(categories['category']) == ['Electronics']
+    assert categories['revenue'].iloc[0] == 200.0
+
+def test_payment_methods_panel_counts_all_statuses(tmp_path):
+    engine = seeded_engine(tmp_path)
+
+    payments = payment_methods(engine, hours=24)
+
+    assert payments.to_dict('records') == [{'payment_method': 'paypal', 'transaction_count': 9}]
@@ -3,7 +3,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from src.database.models import Base, Transaction, Product
 from src.database.operations import DatabaseOperations
-from datetime import datetime
+from datetime import datetime, timedelta
 
 @pytest.fixture
 def db_session():
@@ -78,3 +78,387 @@ def test_save_metric(db_session):
     assert metric is not None
     assert metric.metric_name == 'daily_revenue'
     assert metric.metric_value == 15000.0
+
+def test_copy_insert_transactions_falls_back_to_orm(db_session, sample_transactions):
+    ops = DatabaseOperations(db_session)
+    second = dict(sample_transactions[0], transaction_id='TXN002')
+    loaded = ops.copy_insert_transactions(sample_transactions + [second], chunk_size=1)
+    
+    assert loaded == 2
+    assert db_session.query(Transaction).count() == 2
+
+def test_copy_insert_transactions_upsert_is_idempotent(db_session, sample_transactions):
+    ops = DatabaseOperations(db_session)
+    ops.copy_insert_transactions(sample_transactions, upsert=True)
+    
+    updated = [dict(sample_transactions[0], status='failed')]
+    ops.copy_insert_transactions(updated, upsert=True)
+    
+    assert db_session.query(Transaction).count() == 1
+    assert db_session.query(Transaction).one().status == 'failed'
+
+def test_rows_to_csv_writes_nulls_as_empty_fields():
+    import csv
+    from src.database.loader import rows_to_csv, TRANSACTION_COLUMNS
+    
+    row = {'transaction_id': 'TXN001', 'customer_id': 'CUST, "VIP"', 'payment_method': None}
+    fields = next(csv.reader(rows_to_csv([row])))
+    
+    assert len(fields) == len(TRANSACTION_COLUMNS)
+    assert fields[TRANSACTION_COLUMNS.index('customer_id')] == 'CUST, "VIP"'
+    assert fields[TRANSACTION_COLUMNS.index('payment_method')] == ''
+
+def explain_executed(session, run):
+    from sqlalchemy import event
+    
+    statements = []
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+    
+    engine = session.get_bind()
+    event.listen(engine, 'before_cursor_execute', capture)
+    try:
+        run()
+    finally:
+        event.remove(engine, 'before_cursor_execute', capture)
+    
+    plans = []
+    for statement, parameters in statements:
+        rows = session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+        plans.append(' '.join(row[-1] for row in rows))
+    return plans
+
+def test_hot_queries_use_transaction_indexes(db_session, sample_transactions):
+    ops = DatabaseOperations(db_session)
+    ops.bulk_insert_transactions(sample_transactions)
+    
+    [recent_plan] = explain_executed(db_session, lambda: ops.get_recent_transactions(limit=10))
+    [clv_plan] = explain_executed(db_session, lambda: ops.get_customer_lifetime_value('CUST001'))
+    [raw_clv_plan] = explain_executed(
+        db_session, lambda: DatabaseOperations(db_session, use_rollups=False).get_customer_lifetime_value('CUST001')
+    )
+    
+    assert 'USING INDEX ix_transactions_timestamp' in recent_plan
+    assert 'SEARCH customer_stats' in clv_plan
+    assert 'USING INDEX ix_transactions_customer_id' in raw_clv_plan
+
+def test_init_db_creates_missing_indexes(tmp_path):
+    from sqlalchemy import inspect
+    from src.database.models import init_db
+    
+    database_url = f"sqlite:///{tmp_path / 'legacy.db'}"
+    engine = create_engine(database_url)
+    Transaction.__table__.create(engine)
+    for index in Transaction.__table__.indexes:
+        index.drop(engine)
+    
+    init_db(database_url)
+    
+    index_names = {index['name'] for index in inspect(create_engine(database_url)).get_indexes('transactions')}
+    assert {
+        'ix_transactions_timestamp',
+        'ix_transactions_customer_id',
+        'ix_transactions_product_id',
+        'ix_transactions_status_timestamp',
+        'ix_transactions_completed_timestamp'
+    } <= index_names
+
+def test_partition_bounds_and_names():
+    from src.database.partitions import floor_bound, next_bound, partition_name, parse_partition_name
+    
+    moment = datetime(2024, 12, 31, 18, 30)
+    month = floor_bound(moment, 'month')
+    day = floor_bound(moment, 'day')
+    
+    assert next_bound(month, 'month') == datetime(2025, 1, 1)
+    assert next_bound(day, 'day') == datetime(2025, 1, 1)
+    assert partition_name(month, 'month') == 'transactions_p202412'
+    assert parse_partition_name('transactions_p20241231') == (datetime(2024, 12, 31), datetime(2025, 1, 1))
+    assert parse_partition_name('transactions_p202412') == (datetime(2024, 12, 1), datetime(2025, 1, 1))
+    assert parse_partition_name('transactions_default') is None
+
+def test_partitioned_table_ddl_includes_partition_key_in_primary_key():
+    from sqlalchemy.dialects import postgresql
+    from src.database.partitions import create_table_ddl
+    
+    ddl = create_table_ddl(postgresql.dialect())
+    
+    assert 'PRIMARY KEY (transaction_id, timestamp)' in ddl
+    assert ddl.endswith('PARTITION BY RANGE (timestamp)')
+    assert 'total_amount FLOAT NOT NULL' in ddl
+
+class RecordingEngine:
+    def __init__(self):
+        self.statements = []
+    
+    def begin(self):
+        return self
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+    
+    def execute(self, statement):
+        self.statements.append(str(statement))
+
+def test_ensure_range_creates_only_missing_partitions():
+    from src.database.partitions import PartitionManager
+    
+    engine = RecordingEngine()
+    manager = PartitionManager(engine, 'day')
+    manager.covered = {datetime(2024, 3, 2)}
+    
+    created = manager.ensure_range(datetime(2024, 3, 1, 23), datetime(2024, 3, 3, 1))
+    
+    assert created == ['transactions_p20240301', 'transactions_p20240303']
+    assert "FOR VALUES FROM ('2024-03-03T00:00:00') TO ('2024-03-04T00:00:00')" in engine.statements[-1]
+    assert manager.ensure_range(datetime(2024, 3, 1), datetime(2024, 3, 3)) == []
+    assert len(engine.statements) == 2
+
+@pytest.fixture
+def catalog_transactions(db_session):
+    db_session.add_all([
+        Product(product_id='PRD001', name='Laptop', category='Electronics', price=100.0, cost=50.0),
+        Product(product_id='PRD002', name='Shirt', category='Clothing', price=20.0, cost=5.0),
+    ])
+    db_session.commit()
+    
+    now = datetime.utcnow()
+    return [
+        {
+            'transaction_id': f'TXN{i:03d}',
+            'timestamp': now - timedelta(hours=i % 3),
+            'customer_id': f'CUST{i % 4:03d}',
+            'product_id': 'PRD001' if i % 2 else 'PRD002',
+            'quantity': 1 + i % 2,
+            'unit_price': 100.0 if i % 2 else 20.0,
+            'total_amount': (100.0 if i % 2 else 20.0) * (1 + i % 2),
+            'payment_method': 'paypal' if i % 3 else 'credit_card',
+            'status': 'failed' if i % 5 == 0 else 'completed'
+        }
+        for i in range(12)
+    ]
+
+def test_rollup_reads_match_raw_queries(db_session, catalog_transactions):
+    ops = DatabaseOperations(db_session)
+    raw = DatabaseOperations(db_session, use_rollups=False)
+    ops.bulk_insert_transactions(catalog_transactions)
+    
+    assert [tuple(row) for row in ops.get_top_products()] == [tuple(row) for row in raw.get_top_products()]
+    assert sorted(tuple(row) for row in ops.get_sales_by_category()) == \
+        sorted(tuple(row) for row in raw.get_sales_by_category())
+    assert ops.calculate_conversion_rate() == raw.calculate_conversion_rate()
+
+def test_revenue_by_period_reads_hourly_rollups(db_session, catalog_transactions):
+    ops = DatabaseOperations(db_session)
+    ops.bulk_insert_transactions(catalog_transactions)
+    
+    periods = ops.get_revenue_by_period('hour', hours=24)
+    
+    assert len(periods) == 3
+    assert sum(row.count for row in periods) == 12
+    assert sum(row.revenue for row in periods) == sum(t['total_amount'] for t in catalog_transactions)
+
+def test_rollup_rebuild_matches_incremental_rollups(db_session, catalog_transactions):
+    from src.database.models import SalesRollup
+    from src.database.rollups import RollupAggregator
+    
+    ops = DatabaseOperations(db_session)
+    ops.bulk_insert_transactions(catalog_transactions[:6])
+    ops.bulk_insert_transactions(catalog_transactions[6:])
+    columns = [column for column in SalesRollup.__table__.columns]
+    incremental = sorted(db_session.query(*columns).all())
+    
+    RollupAggregator(db_session).rebuild(chunk_size=5)
+    
+    assert sorted(db_session.query(*columns).all()) == incremental
+
+def test_rollups_pick_up_products_loaded_after_their_first_sale(db_session, catalog_transactions):
+    ops = DatabaseOperations(db_session)
+    unknown = [dict(txn, product_id='PRD003') for txn in catalog_transactions[:2]]
+    ops.bulk_insert_transactions(unknown)
+    db_session.add(Product(product_id='PRD003', name='Lamp', category='Home', price=20.0, cost=5.0))
+    db_session.commit()
+    
+    ops.bulk_insert_transactions([dict(txn, product_id='PRD003') for txn in catalog_transactions[2:4]])
+    
+    assert [row.category for row in ops.get_sales_by_category()] == ['Home']
+
+def test_cleanup_old_data_removes_expired_rollups(db_session, catalog_transactions):
+    for txn in catalog_transactions:
+        txn['timestamp'] -= timedelta(days=40)
+    ops = DatabaseOperations(db_session)
+    ops.bulk_insert_transactions(catalog_transactions)
+    
+    ops.cleanup_old_data(30)
+    
+    assert db_session.query(Transaction).count() == 0
+    assert ops.get_top_products() == []
+    assert ops.get_sales_by_category() == []
+
+def test_bulk_insert_skips_replayed_transactions(db_session, catalog_transactions):
+    from src.database.models import SalesRollup
+    
+    ops = DatabaseOperations(db_session)
+    ops.bulk_insert_transactions(catalog_transactions[:8])
+    columns = [column for column in SalesRollup.__table__.columns]
+    before = sorted(db_session.query(*columns).all())
+    
+    inserted = ops.bulk_insert_transactions(catalog_transactions[4:8] + catalog_transactions[4:8])
+    
+    assert inserted == []
+    assert db_session.query(Transaction).count() == 8
+    assert sorted(db_session.query(*columns).all()) == before
+    assert len(ops.bulk_insert_transactions(catalog_transactions[6:])) == 4
+
+@pytest.mark.parametrize('use_rollups', [True, False])
+def test_get_kpis_counts_statuses_in_one_scan(db_session, catalog_transactions, use_rollups):
+    catalog_transactions[7]['status'] = 'pending'
+    DatabaseOperations(db_session).bulk_insert_transactions(catalog_transactions)
+    ops = DatabaseOperations(db_session, use_rollups=use_rollups)
+    completed = [t for t in catalog_transactions if t['status'] == 'completed']
+    revenue = sum(t['total_amount'] for t in completed)
+    
+    kpis = ops.get_kpis(hours=24)
+    
+    assert (kpis['total'], kpis['completed'], kpis['failed'], kpis['pending']) == (12, 8, 3, 1)
+    assert kpis['revenue'] == pytest.approx(revenue)
+    assert kpis['avg_ticket'] == pytest.approx(revenue / 8)
+    assert kpis['conversion_rate'] == pytest.approx(8 / 12 * 100)
+    assert ops.calculate_conversion_rate() == pytest.approx(kpis['conversion_rate'])
+
+def test_get_kpis_on_empty_window(db_session):
+    kpis = DatabaseOperations(db_session).get_kpis(hours=1)
+    
+    assert kpis == {'total': 0, 'completed': 0, 'failed': 0, 'pending': 0,
+                    'revenue': 0.0, 'avg_ticket': 0.0, 'conversion_rate': 0.0}
+
+def test_customer_lifetime_values_match_per_customer_queries(db_session, catalog_transactions):
+    ops = DatabaseOperations(db_session)
+    raw = DatabaseOperations(db_session, use_rollups=False)
+    ops.bulk_insert_transactions(catalog_transactions[:5])
+    ops.bulk_insert_transactions(catalog_transactions[5:])
+    
+    values = ops.get_customer_lifetime_values()
+    
+    assert values == raw.get_customer_lifetime_values()
+    assert set(values) == {'CUST000', 'CUST001', 'CUST002', 'CUST003'}
+    for customer_id, entry in values.items():
+        assert entry['lifetime_value'] == pytest.approx(raw.get_customer_lifetime_value(customer_id))
+        assert ops.get_customer_lifetime_value(customer_id) == pytest.approx(entry['lifetime_value'])
+    assert list(ops.get_customer_lifetime_values(['CUST001'])) == ['CUST001']
+
+def test_customer_stats_rebuild_matches_incremental_stats(db_session, catalog_transactions):
+    from src.database.models import CustomerStats
+    
+    ops = DatabaseOperations(db_session)
+    ops.bulk_insert_transactions(catalog_transactions[:6])
+    ops.bulk_insert_transactions(catalog_transactions[6:])
+    columns = [column for column in CustomerStats.__table__.columns]
+    incremental = sorted(db_session.query(*columns).all())
+    
+    assert ops.refresh_customer_stats() == 4
+    assert sorted(db_session.query(*columns).all()) == incremental
+
+def test_refresh_customer_stats_since_only_touches_recent_customers(db_session, catalog_transactions):
+    from src.database.models import CustomerStats
+    
+    for txn in catalog_transactions:
+        if txn['customer_id'] != 'CUST001':
+            txn['timestamp'] -= timedelta(days=2)
+    ops = DatabaseOperations(db_session)
+    ops.bulk_insert_transactions(catalog_transactions)
+    expected = ops.get_customer_lifetime_values()
+    db_session.query(CustomerStats).update({'lifetime_value': 0.0})
+    db_session.commit()
+    
+    assert ops.refresh_customer_stats(since=datetime.utcnow() - timedelta(days=1)) == 1
+    
+    values = ops.get_customer_lifetime_values()
+    assert values['CUST001'] == expected['CUST001']
+    assert values['CUST002']['lifetime_value'] == 0.0
+
+def test_refresh_customer_stats_drops_customers_whose_orders_failed(db_session, catalog_transactions):
+    ops = DatabaseOperations(db_session)
+    ops.bulk_insert_transactions(catalog_transactions)
+    db_session.query(Transaction).filter(Transaction.customer_id == 'CUST001')\
+        .update({'status': 'failed'})
+    db_session.commit()
+    
+    assert ops.refresh_customer_stats(since=datetime.utcnow() - timedelta(days=1)) == 4
+    
+    assert ops.get_customer_lifetime_value('CUST001') == 0.0
+    assert 'CUST001' not in ops.get_customer_lifetime_values()
+    assert ops.get_customer_lifetime_values() == DatabaseOperations(db_session, use_rollups=False).get_customer_lifetime_values()
+
+def test_cleanup_old_data_keeps_customer_stats_in_line_with_rebuild(db_session, catalog_transactions):
+    from src.database.models import CustomerStats
+    
+    for txn in catalog_transactions[:6]:
+        txn['timestamp'] -= timedelta(days=40)
+    ops = DatabaseOperations(db_session)
+    ops.bulk_insert_transactions(catalog_transactions)
+    
+    ops.cleanup_old_data(30)
+    columns = [column for column in CustomerStats.__table__.columns]
+    incremental = sorted(db_session.query(*columns).all())
+    ops.refresh_customer_stats()
+    
+    assert sorted(db_session.query(*columns).all()) == incremental
+    assert ops.get_customer_lifetime_values() == DatabaseOperations(db_session, use_rollups=False).get_customer_lifetime_values()
+
+def test_iter_transactions_pages_by_timestamp_and_id(db_session, catalog_transactions):
+    for txn in catalog_transactions[:4]:
+        txn['timestamp'] = catalog_transactions[0]['timestamp']
+    ops = DatabaseOperations(db_session)
+    ops.bulk_insert_transactions(catalog_transactions)
+    
+    rows = list(ops.iter_transactions(columns=['transaction_id', 'total_amount'], chunk_size=5))
+    expected = sorted(catalog_transactions, key=lambda t: (t['timestamp'], t['transaction_id']))
+    
+    assert [row.transaction_id for row in rows] == [t['transaction_id'] for t in expected]
+    assert rows[0].total_amount == expected[0]['total_amount']
+
+def test_iter_transaction_frames_respects_window_and_columns(db_session, catalog_transactions):
+    ops = DatabaseOperations(db_session)
+    ops.bulk_insert_transactions(catalog_transactions)
+    start = datetime.utcnow() - timedelta(hours=1, minutes=30)
+    
+    frames = list(ops.iter_transaction_frames(start=start, columns=['transaction_id', 'status'], chunk_size=3))
+    
+    assert [len(frame) for frame in frames] == [3, 3, 2]
+    assert list(frames[0].columns) == ['transaction_id', 'status']
+    assert sum(len(frame) for frame in frames) == sum(t['timestamp'] >= start for t in catalog_transactions)
+
+def test_get_session_reuses_session_factory(tmp_path):
+    from src.database.models import get_engine, get_session, get_session_factory
+    
+    engine = get_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+    first, second = get_session(engine), get_session(engine)
+    
+    assert first is not second
+    assert get_session_factory(engine) is get_session_factory(engine)
+    first.close()
+    second.close()
+
+def test_engine_pool_stats_reports_checked_out_connections(tmp_path):
+    from config.resources import engine_pool_stats
+    from src.database.models import get_engine
+    
+    engine = get_engine(f"sqlite:///{tmp_path / 'pool.db'}", pool_size=2, max_overflow=0)
+    with engine.connect():
+        stats = engine_pool_stats(engine, max_overflow=0)
+    
+    assert stats['size'] == 2
+    assert stats['checked_out'] == 1
+    assert stats['utilization'] == 0.5
+
+def test_redis_pool_stats_tolerates_missing_internals():
+    from config.resources import redis_pool_stats
+    
+    class OpaquePool:
+        max_connections = 10
+    
+    assert redis_pool_stats(OpaquePool()) == {'max_connections': 10}
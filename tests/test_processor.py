@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta
+from src.kafka.processor import WindowAggregator, WindowedProcessor, window_starts
+
+MINUTE = timedelta(minutes=1)
+START = datetime(2024, 1, 1, 12, 0)
+
+class RecordingProducer:
+    def __init__(self):
+        self.sent = []
+
+    def send_many(self, events):
+        self.sent.extend(events)
+        return len(events)
+
+    def close(self):
+        pass
+
+class RecordingCache:
+    def __init__(self):
+        self.values = {}
+
+    def set_many(self, mapping, ttl=None):
+        self.values.update(mapping)
+        return True
+
+def event(seconds, amount=10.0, status='completed', product_id='PRD001', payment_method='paypal'):
+    return {
+        'transaction_id': f'TXN{seconds}',
+        'timestamp': (START + timedelta(seconds=seconds)).isoformat(),
+        'customer_id': 'CUST001',
+        'product_id': product_id,
+        'quantity': 1,
+        'unit_price': amount,
+        'total_amount': amount,
+        'payment_method': payment_method,
+        'status': status
+    }
+
+def test_window_starts_cover_sliding_windows():
+    starts = window_starts(START + timedelta(seconds=150), timedelta(minutes=5), MINUTE)
+
+    assert starts == [START + timedelta(minutes=m) for m in (2, 1, 0, -1, -2)]
+    assert window_starts(START + timedelta(seconds=59), MINUTE, MINUTE) == [START]
+
+def test_tumbling_window_closes_at_watermark_and_drops_late_events():
+    window = WindowAggregator('tumbling', MINUTE, allowed_lateness=timedelta(seconds=10))
+    window.add(START + timedelta(seconds=5), [('all', '')], 1, 10.0, True)
+    window.add(START + timedelta(seconds=30), [('all', '')], 2, 20.0, False)
+    window.add(START + timedelta(seconds=65), [('all', '')], 1, 5.0, True)
+
+    assert window.advance() == []
+    window.add(START + timedelta(seconds=55), [('all', '')], 1, 1.0, True)
+    window.add(START + timedelta(seconds=75), [('all', '')], 1, 5.0, True)
+    results = window.advance()
+
+    assert len(results) == 1
+    assert results[0]['window_start'] == START.isoformat()
+    assert results[0]['count'] == 3
+    assert results[0]['revenue'] == 31.0
+    assert round(results[0]['conversion_rate'], 2) == 66.67
+    assert window.add(START + timedelta(seconds=40), [('all', '')], 1, 1.0, True) is False
+    assert window.late == 1
+
+def test_processor_emits_per_dimension_results_to_kafka_and_redis():
+    producer = RecordingProducer()
+    cache = RecordingCache()
+    processor = WindowedProcessor(
+        [WindowAggregator('tumbling', MINUTE)],
+        categories={'PRD001': 'Electronics'},
+        consumer=object(),
+        producer=producer,
+        cache=cache,
+        idle_timeout=3600
+    )
+    processor.process(event(10, 10.0))
+    processor.process(event(20, 30.0, status='failed', payment_method='crypto'))
+    processor.process(event(70, 5.0))
+
+    results = processor.advance()
+
+    by_dimension = {(r['dimension'], r['dimension_value']): r for r in results}
+    assert by_dimension[('all', '')]['count'] == 2
+    assert by_dimension[('category', 'Electronics')]['revenue'] == 40.0
+    assert by_dimension[('payment_method', 'crypto')]['conversion_rate'] == 0.0
+    assert producer.sent == results
+    assert cache.values['window:tumbling:all:']['revenue'] == 40.0
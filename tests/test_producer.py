@@ -0,0 +1,134 @@
+from src.kafka.producer import SalesProducer, parse_stream
+
+
+class FakeFuture:
+    def __init__(self):
+        self.callbacks = []
+        self.errbacks = []
+
+    def add_callback(self, fn):
+        self.callbacks.append(fn)
+
+    def add_errback(self, fn):
+        self.errbacks.append(fn)
+
+
+class FakeKafkaProducer:
+    def __init__(self):
+        self.futures = []
+        self.flushed = False
+        self.closed = False
+
+    def send(self, topic, value=None, headers=None):
+        future = FakeFuture()
+        self.futures.append(future)
+        return future
+
+    def flush(self, timeout=None):
+        self.flushed = True
+
+    def close(self):
+        self.closed = True
+
+
+def test_send_many_counts_deliveries_and_failures():
+    fake = FakeKafkaProducer()
+    producer = SalesProducer(producer=fake)
+
+    queued = producer.send_many([{'transaction_id': f'TXN{i}'} for i in range(3)])
+    fake.futures[0].callbacks[0](None)
+    fake.futures[1].callbacks[0](None)
+    fake.futures[2].errbacks[0](Exception('broker down'))
+
+    assert queued == 3
+    assert producer.delivered == 2
+    assert producer.failed == 1
+
+def test_send_async_applies_backpressure():
+    fake = FakeKafkaProducer()
+    producer = SalesProducer(max_in_flight=2, producer=fake)
+
+    assert producer.send_async({'transaction_id': 'TXN1'}) is True
+    assert producer.send_async({'transaction_id': 'TXN2'}) is True
+    assert producer.send_async({'transaction_id': 'TXN3'}, timeout=0.01) is False
+
+    fake.futures[0].callbacks[0](None)
+    assert producer.send_async({'transaction_id': 'TXN3'}, timeout=0.01) is True
+
+def test_close_flushes_before_closing():
+    fake = FakeKafkaProducer()
+    with SalesProducer(producer=fake):
+        pass
+
+    assert fake.flushed
+    assert fake.closed
+
+class FakeStreamResponse:
+    def __init__(self, lines):
+        self.lines = lines
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def raise_for_status(self):
+        pass
+
+    def iter_lines(self, chunk_size=None):
+        return iter(self.lines)
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+        self.closed = False
+
+    def get(self, url, **kwargs):
+        self.requests.append(kwargs['params'])
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def close(self):
+        self.closed = True
+
+def test_parse_stream_accepts_sse_and_ndjson():
+    lines = [b'data: {"transaction_id": "TXN1"}', b'', b'{"transaction_id": "TXN2"}']
+
+    assert [event['transaction_id'] for event in parse_stream(lines)] == ['TXN1', 'TXN2']
+
+def test_stream_from_api_batches_and_reconnects(monkeypatch):
+    monkeypatch.setattr('src.kafka.producer.time.sleep', lambda seconds: None)
+    fake = FakeKafkaProducer()
+    producer = SalesProducer(producer=fake)
+    session = FakeSession([
+        FakeStreamResponse([f'{{"transaction_id": "TXN{i}"}}'.encode() for i in range(3)]),
+        ConnectionError('reset by peer'),
+        FakeStreamResponse([f'{{"transaction_id": "TXN{i}"}}'.encode() for i in range(3, 10)]),
+    ])
+
+    metrics = producer.stream_from_api(api_url='http://api/stream', batch_size=4, session=session, max_events=8)
+
+    assert metrics['received'] == 8
+    assert len(fake.futures) == 8
+    assert len(session.requests) == 3
+    assert session.requests[0]['batch'] == 4
+    assert session.closed and fake.closed
+
+def test_stream_from_api_backs_off_on_empty_streams(monkeypatch):
+    delays = []
+    monkeypatch.setattr('src.kafka.producer.time.sleep', delays.append)
+    fake = FakeKafkaProducer()
+    producer = SalesProducer(producer=fake)
+    session = FakeSession([FakeStreamResponse([]) for _ in range(3)] + [
+        FakeStreamResponse([f'{{"transaction_id": "TXN{i}"}}'.encode() for i in range(2)]),
+    ])
+
+    metrics = producer.stream_from_api(api_url='http://api/stream', session=session, max_events=2)
+
+    assert metrics['received'] == 2
+    assert delays == [1, 2, 4]
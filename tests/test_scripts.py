@@ -0,0 +1,103 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+import load_data
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+    
+    def copy_expert(self, sql, buffer):
+        self.connection.copies.append(buffer.getvalue().splitlines())
+
+class FakeConnection:
+    def __init__(self):
+        self.copies = []
+        self.commits = 0
+        self.closed = False
+    
+    def cursor(self):
+        return FakeCursor(self)
+    
+    def commit(self):
+        self.commits += 1
+    
+    def close(self):
+        self.closed = True
+
+class FakeEngine:
+    dialect = SimpleNamespace(name='fake')
+    
+    def __init__(self):
+        self.connection = FakeConnection()
+    
+    def raw_connection(self):
+        return self.connection
+
+def write_transactions(path, n):
+    pd.DataFrame({
+        'transaction_id': [f'TXN{i:03d}' for i in range(n)],
+        'timestamp': ['2024-03-01T09:00:00'] * n,
+        'customer_id': ['CUST001'] * n,
+        'product_id': ['PRD001'] * n,
+        'quantity': [1] * n,
+        'unit_price': [10.0] * n,
+        'total_amount': [10.0] * n,
+        'payment_method': ['paypal'] * n,
+        'status': ['completed'] * n,
+    }).to_csv(path, index=False)
+
+def test_read_chunks_streams_csv_in_fixed_size_chunks(tmp_path):
+    path = tmp_path / 'transactions.csv'
+    write_transactions(path, 7)
+    
+    assert [len(chunk) for chunk in load_data.read_chunks(path, 3)] == [3, 3, 1]
+
+def test_load_transactions_copies_one_chunk_at_a_time(tmp_path):
+    path = tmp_path / 'transactions.csv'
+    write_transactions(path, 7)
+    engine = FakeEngine()
+    
+    rows, revenue = load_data.load_transactions(engine, [path], chunk_size=3)
+    
+    assert (rows, revenue) == (7, 70.0)
+    assert [len(copy) for copy in engine.connection.copies] == [3, 3, 1]
+    assert engine.connection.copies[0][0].startswith('TXN000,2024-03-01 09:00:00,CUST001')
+    assert engine.connection.commits == 3
+    assert engine.connection.closed
+
+def test_load_transactions_handles_empty_input(tmp_path):
+    path = tmp_path / 'transactions.csv'
+    path.write_text('')
+    
+    assert load_data.load_transactions(FakeEngine(), [path], chunk_size=3) == (0, 0.0)
+    assert load_data.load_transactions(FakeEngine(), [], chunk_size=3) == (0, 0.0)
+
+def read_shards(directory):
+    return pd.concat(
+        [pd.read_csv(path) for path in sorted(directory.glob('part-*'))],
+        ignore_index=True
+    ).drop(columns=['timestamp'])
+
+def test_shards_are_identical_whatever_the_worker_count(tmp_path):
+    import generate_dataset
+    
+    products = generate_dataset.generate_products(20)
+    customers = generate_dataset.generate_customers(50)
+    serial = generate_dataset.generate_transaction_shards(
+        products, customers, 2500, tmp_path / 'serial', shard_size=1000, workers=1, seed=7
+    )
+    parallel = generate_dataset.generate_transaction_shards(
+        products, customers, 2500, tmp_path / 'parallel', shard_size=1000, workers=2, seed=7
+    )
+    
+    assert serial[0] == parallel[0] == 2500
+    assert serial[1] == parallel[1]
+    frame = read_shards(tmp_path / 'serial')
+    pd.testing.assert_frame_equal(frame, read_shards(tmp_path / 'parallel'))
+    assert frame['transaction_id'].is_unique
+    assert len(list((tmp_path / 'serial').glob('part-*'))) == 3
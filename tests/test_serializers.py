@@ -0,0 +1,60 @@
+import pytest
+from collections import namedtuple
+from src.kafka.serializers import StructSerializer, decode_message, encode_event, get_serializer
+
+Message = namedtuple('Message', ['value', 'headers'])
+
+EVENT = {
+    'transaction_id': 'TXN00000042',
+    'timestamp': '2024-03-01T09:15:30.250000',
+    'customer_id': 'CUST000007',
+    'product_id': 'PRD00012',
+    'quantity': 3,
+    'unit_price': 19.99,
+    'total_amount': 59.97,
+    'payment_method': 'paypal',
+    'status': 'completed'
+}
+
+def test_struct_round_trip_is_smaller_than_json():
+    serializer = StructSerializer()
+    data = serializer.dumps(EVENT)
+
+    assert serializer.loads(data) == EVENT
+    assert len(data) < len(get_serializer('json').dumps(EVENT)) / 2
+
+def test_struct_keeps_null_strings():
+    serializer = StructSerializer()
+    event = dict(EVENT, payment_method=None)
+
+    assert serializer.loads(serializer.dumps(event))['payment_method'] is None
+
+def test_struct_converts_aware_timestamps_to_utc():
+    serializer = StructSerializer()
+    event = dict(EVENT, timestamp='2024-03-01T11:15:30.250000+02:00')
+
+    assert serializer.loads(serializer.dumps(event))['timestamp'] == EVENT['timestamp']
+
+@pytest.mark.parametrize('length', [0xFFFF, 0x10000])
+def test_struct_rejects_strings_that_overflow_the_length_field(length):
+    with pytest.raises(ValueError):
+        StructSerializer().dumps(dict(EVENT, customer_id='C' * length))
+
+def test_struct_accepts_longest_string():
+    serializer = StructSerializer()
+    event = dict(EVENT, customer_id='C' * 0xFFFE)
+
+    assert serializer.loads(serializer.dumps(event)) == event
+
+@pytest.mark.parametrize('name', ['json', 'struct'])
+def test_headers_select_the_decoder(name):
+    message = Message(*encode_event(EVENT, get_serializer(name)))
+
+    assert decode_message(message) == EVENT
+
+def test_messages_without_headers_default_to_json():
+    assert decode_message(Message(get_serializer('json').dumps(EVENT), None)) == EVENT
+
+def test_unknown_serializer_is_rejected():
+    with pytest.raises(ValueError):
+        get_serializer('avro')